@@ -6,11 +6,15 @@
 import sys
 from pathlib import Path
 
-# 添加src目录到Python路径
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
-from book_splitter.main import BookSplitter
-from book_splitter.config import ProcessingConfig
+try:
+    # 优先使用已安装的包（pip install -e .），避免改动 sys.path
+    from book_splitter.main import BookSplitter
+    from book_splitter.config import ProcessingConfig
+except ImportError:
+    # 未安装时回退到源码目录运行
+    sys.path.insert(0, str(Path(__file__).parent / "src"))
+    from book_splitter.main import BookSplitter
+    from book_splitter.config import ProcessingConfig
 
 def main():
     """运行书籍拆分器"""
@@ -6,27 +6,61 @@
 
 import re
 import logging
+from bisect import bisect_right
+from collections import Counter
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
 from ..models import ChapterInfo, SectionInfo
 
 
+# 各标题模式共用的编号字符集（中文数字或阿拉伯数字）
+_CN_NUM = r'[一二三四五六七八九十0-9]'
+
+
+def _whitespace_tolerant(pattern: str) -> str:
+    """将针对 strip() 后单行文本编写的 ^...$ 模式改写为可在整篇文本上多行匹配的形式
+    
+    首尾空白由正则吸收；(?<=\S) 保证原模式的匹配恰好结束于最后一个非空白字符，
+    因此匹配结果与先 strip() 再匹配完全一致。所有 \s 都排除换行符，确保匹配不会跨行。
+    """
+    body = pattern[1:-1].replace(r'\s', r'[^\S\n]')
+    return r'^[^\S\n]*' + body + r'(?<=\S)[^\S\n]*$'
+
+
 class StructureAnalyzer:
     """文档结构分析器"""
     
     # 章节和小节识别的正则表达式模式
-    CHAPTER_PATTERN = r'^#\s*第([一二三四五六七八九十0-9]+)章(?:\s+(.+?)(?:\s+…+.*)?)?$'
+    CHAPTER_PATTERN = rf'^#\s*第({_CN_NUM}+)章(?:\s+(.+?)(?:\s+…+.*)?)?$'
     # 添加对 "## 一、" 格式的支持
-    CHAPTER_PATTERN_ALT = r'^## ([一二三四五六七八九十0-9]+)、(.+?)$'
+    CHAPTER_PATTERN_ALT = rf'^## ({_CN_NUM}+)、(.+?)$'
     SECTION_PATTERNS = {
-        2: r'^# 第[一二三四五六七八九十0-9]+节\s+(.+?)(?:\s+\d+)?$',
-        3: r'^[一二三四五六七八九十0-9]+、\s*(.+?)(?:\s+\d+)?$',
-        4: r'^\([一二三四五六七八九十0-9]+\)\s*(.+?)(?:\s+\d+)?$',
+        2: rf'^# 第{_CN_NUM}+节\s+(.+?)(?:\s+\d+)?$',
+        3: rf'^{_CN_NUM}+、\s*(.+?)(?:\s+\d+)?$',
+        4: rf'^\({_CN_NUM}+\)\s*(.+?)(?:\s+\d+)?$',
         # 添加对 "### （一）" 格式的支持
-        5: r'^### （[一二三四五六七八九十0-9]+）(.+?)$'
+        5: rf'^### （{_CN_NUM}+）(.+?)$'
     }
     
+    # 预编译的正则表达式（每个进程只编译一次）
+    _PAGE_NUMBER_RE = re.compile(r'\s+\d+$')
+    _CHAPTER_NUMBER_RE = re.compile(rf'第({_CN_NUM}+)章')
+    
+    # 章节与各级小节模式合并为单个交替正则，按 lastgroup 分派；
+    # 模式容忍首尾空白，并以 MULTILINE 方式直接在整篇文本上查找
+    _HEADING_RE = re.compile('|'.join(
+        [f'(?P<chapter>{_whitespace_tolerant(CHAPTER_PATTERN)})',
+         f'(?P<chapter_alt>{_whitespace_tolerant(CHAPTER_PATTERN_ALT)})'] +
+        [f'(?P<section_{level}>{_whitespace_tolerant(pattern)})'
+         for level, pattern in SECTION_PATTERNS.items()]
+    ), re.MULTILINE)
+    _SECTION_LEVELS = {f'section_{level}': level for level in SECTION_PATTERNS}
+    
+    # 预筛选：只有首个非空白字符可能开始标题的行才交给组合正则完整匹配。
+    # 字符集需覆盖上面所有模式的首字符：'#'、编号数字和 '('
+    _HEADING_START_RE = re.compile(r'^[^\S\n]*[#(一二三四五六七八九十0-9]', re.MULTILINE)
+    
     def __init__(self, source_file: str):
         """初始化结构分析器
         
@@ -39,7 +73,8 @@ class StructureAnalyzer:
         # 存储分析结果
         self.chapters: List[ChapterInfo] = []
         self.sections: List[SectionInfo] = []
-        self._lines: List[str] = []
+        self._text: str = ""
+        self._total_lines: int = 0
         
         # 验证源文件存在
         if not Path(source_file).exists():
@@ -56,12 +91,9 @@ class StructureAnalyzer:
         # 读取文件内容（仅读取一次）
         self._read_file()
         
-        # 识别章节
-        self.chapters = self.find_chapters()
+        # 单次遍历识别章节和小节
+        self.chapters, self.sections = self._scan()
         self.logger.info(f"识别到 {len(self.chapters)} 个章节")
-        
-        # 识别小节
-        self.sections = self.find_sections()
         self.logger.info(f"识别到 {len(self.sections)} 个小节")
         
         # 建立章节和小节的关联关系
@@ -73,168 +105,188 @@ class StructureAnalyzer:
         }
     
     def _read_file(self):
-        """读取源文件内容到内存"""
+        """读取源文件内容到内存（整篇文本，不拆分为行列表）"""
         try:
             with open(self.source_file, 'r', encoding='utf-8') as f:
-                self._lines = f.readlines()
-            self.logger.debug(f"读取文件完成，共 {len(self._lines)} 行")
+                self._text = f.read()
+            # 与 readlines() 的行数保持一致：最后一行没有换行符时也计为一行
+            self._total_lines = self._text.count('\n')
+            if self._text and not self._text.endswith('\n'):
+                self._total_lines += 1
+            self.logger.debug(f"读取文件完成，共 {self._total_lines} 行")
         except Exception as e:
             raise IOError(f"读取文件失败: {str(e)}")
     
+    def get_source_text(self) -> str:
+        """获取已读取的源文件全文（供内容提取复用，避免再次读取文件）"""
+        return self._text
+    
     def find_chapters(self) -> List[ChapterInfo]:
         """识别所有章节边界
         
         Returns:
             章节信息列表
         """
+        chapters, _ = self._scan()
+        return chapters
+    
+    def find_sections(self) -> List[SectionInfo]:
+        """识别所有小节边界
+        
+        Returns:
+            小节信息列表
+        """
+        _, sections = self._scan()
+        return sections
+    
+    def _scan(self) -> Tuple[List[ChapterInfo], List[SectionInfo]]:
+        """单次遍历文档，同时识别章节和小节边界
+        
+        先用只检查行首字符的预筛选正则在整篇文本上 finditer 找出候选行，
+        再对候选行执行组合正则，根据命中的命名分组区分章节或小节；
+        行号通过统计相邻两次匹配之间的换行符数量增量计算。
+        
+        Returns:
+            (章节信息列表, 小节信息列表)
+        """
         chapters = []
-        chapter_pattern = re.compile(self.CHAPTER_PATTERN)
-        chapter_pattern_alt = re.compile(self.CHAPTER_PATTERN_ALT)
+        sections = []
+        text = self._text
+        heading_re = self._HEADING_RE
+        current_chapter = None
+        line_num = 1
+        last_pos = 0
+        # 调试日志通常关闭，循环前判断一次，避免逐条格式化日志消息
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         
-        for line_num, line in enumerate(self._lines, 1):
-            line = line.strip()
-            match = chapter_pattern.match(line)
-            match_alt = chapter_pattern_alt.match(line)
+        for candidate in self._HEADING_START_RE.finditer(text):
+            start = candidate.start()
+            match = heading_re.match(text, start)
+            if not match:
+                continue
             
-            if match:
-                chapter_num = match.group(1).strip()
-                raw_title = match.group(2).strip() if match.group(2) else ""
+            line_num += text.count('\n', last_pos, start)
+            last_pos = start
+            
+            # 命名分组内部的捕获组紧随其后编号
+            kind = match.lastgroup
+            base = match.lastindex
+            
+            if kind == 'chapter':
+                chapter_num = match.group(base + 1).strip()
+                raw_title = match.group(base + 2).strip() if match.group(base + 2) else ""
                 # 清理标题中的页码等信息
-                title = re.sub(r'\s+\d+$', '', raw_title) if raw_title else ""
+                title = self._PAGE_NUMBER_RE.sub('', raw_title) if raw_title else ""
                 full_title = f"第{chapter_num}章" + (f" {title}" if title else "")
                 
-                chapter_info = ChapterInfo(
+                current_chapter = ChapterInfo(
                     title=full_title,
                     start_line=line_num,
                     end_line=line_num + 1  # 临时设置，后续会更新
                 )
-                chapters.append(chapter_info)
-                self.logger.debug(f"发现章节: {chapter_info.title} (行 {line_num})")
-            elif match_alt:
+                chapters.append(current_chapter)
+                if debug:
+                    self.logger.debug(f"发现章节: {current_chapter.title} (行 {line_num})")
+            elif kind == 'chapter_alt':
                 # 处理 "## 一、" 格式
-                chapter_num = match_alt.group(1).strip()
-                title = match_alt.group(2).strip()
+                chapter_num = match.group(base + 1).strip()
+                title = match.group(base + 2).strip()
                 
-                chapter_info = ChapterInfo(
+                current_chapter = ChapterInfo(
                     title=f"{chapter_num}、{title}",
                     start_line=line_num,
                     end_line=line_num + 1  # 临时设置，后续会更新
                 )
-                chapters.append(chapter_info)
-                self.logger.debug(f"发现章节: {chapter_info.title} (行 {line_num})")
+                chapters.append(current_chapter)
+                if debug:
+                    self.logger.debug(f"发现章节: {current_chapter.title} (行 {line_num})")
+            else:
+                level = self._SECTION_LEVELS[kind]
+                title = match.group(base + 1).strip()
+                
+                section_info = SectionInfo(
+                    title=title,
+                    start_line=line_num,
+                    end_line=line_num + 1,  # 临时设置
+                    chapter_title=current_chapter.title if current_chapter else "未知章节",
+                    level=level
+                )
+                sections.append(section_info)
+                if debug:
+                    self.logger.debug(f"发现小节: {section_info.title} (行 {line_num}, 级别 {level})")
         
         # 计算每个章节的结束行号
+        self._calculate_chapter_end_lines(chapters)
+        
+        # 计算每个小节的结束行号（依赖章节边界）
+        self.chapters = chapters
+        self._calculate_section_end_lines(sections)
+        
+        return chapters, sections
+    
+    def _calculate_chapter_end_lines(self, chapters: List[ChapterInfo]):
+        """计算章节的结束行号"""
         for i in range(len(chapters)):
             if i < len(chapters) - 1:
                 chapters[i].end_line = chapters[i + 1].start_line - 1
             else:
-                chapters[i].end_line = len(self._lines)
+                chapters[i].end_line = self._total_lines
             
             # 确保结束行号大于起始行号
             if chapters[i].end_line <= chapters[i].start_line:
                 chapters[i].end_line = chapters[i].start_line + 1
-        
-        return chapters
     
-    def find_sections(self) -> List[SectionInfo]:
-        """识别所有小节边界
+    def _calculate_section_end_lines(self, sections: List[SectionInfo]):
+        """计算小节的结束行号
         
-        Returns:
-            小节信息列表
+        使用按级别单调递增的栈：遇到新小节时，栈顶所有级别数值不小于它的小节
+        （同级或更低级）都以新小节的前一行为边界；遍历结束后仍在栈中的小节以文档末尾为边界。
         """
-        sections = []
+        next_boundaries = [self._total_lines] * len(sections)
+        open_sections: List[int] = []
         
-        # 编译所有小节模式
-        compiled_patterns = {
-            level: re.compile(pattern) 
-            for level, pattern in self.SECTION_PATTERNS.items()
-        }
+        for i, section in enumerate(sections):
+            while open_sections and sections[open_sections[-1]].level >= section.level:
+                next_boundaries[open_sections.pop()] = section.start_line - 1
+            open_sections.append(i)
         
-        current_chapter = None
-        
-        for line_num, line in enumerate(self._lines, 1):
-            line = line.strip()
+        # 检查是否有章节边界：小节不能越过其后的第一个章节标题
+        chapter_starts = [chapter.start_line for chapter in self.chapters]
+        for section, next_boundary in zip(sections, next_boundaries):
+            idx = bisect_right(chapter_starts, section.start_line)
+            if idx < len(chapter_starts):
+                next_boundary = min(next_boundary, chapter_starts[idx] - 1)
             
-            # 检查是否是章节标题（用于确定当前章节上下文）
-            if re.match(self.CHAPTER_PATTERN, line) or re.match(self.CHAPTER_PATTERN_ALT, line):
-                current_chapter = self._find_chapter_by_line(line_num)
-                continue
-            
-            # 检查各级小节模式
-            for level, pattern in compiled_patterns.items():
-                match = pattern.match(line)
-                if match:
-                    title = match.group(1).strip()
-                    
-                    section_info = SectionInfo(
-                        title=title,
-                        start_line=line_num,
-                        end_line=line_num + 1,  # 临时设置
-                        chapter_title=current_chapter.title if current_chapter else "未知章节",
-                        level=level
-                    )
-                    sections.append(section_info)
-                    self.logger.debug(f"发现小节: {section_info.title} (行 {line_num}, 级别 {level})")
-                    break
-        
-        # 计算每个小节的结束行号
-        self._calculate_section_end_lines(sections)
-        
-        return sections
-    
-    def _calculate_section_end_lines(self, sections: List[SectionInfo]):
-        """计算小节的结束行号"""
-        for i in range(len(sections)):
-            current_section = sections[i]
-            
-            # 查找下一个同级或更高级的标题
-            next_boundary = len(self._lines)
-            
-            for j in range(i + 1, len(sections)):
-                next_section = sections[j]
-                if next_section.level <= current_section.level:
-                    next_boundary = next_section.start_line - 1
-                    break
-            
-            # 检查是否有章节边界
-            for chapter in self.chapters:
-                if (chapter.start_line > current_section.start_line and 
-                    chapter.start_line < next_boundary):
-                    next_boundary = chapter.start_line - 1
-                    break
-            
-            current_section.end_line = max(next_boundary, current_section.start_line + 1)
+            section.end_line = max(next_boundary, section.start_line + 1)
     
     def _associate_sections_with_chapters(self):
         """建立章节和小节的关联关系"""
+        # 章节按起始行有序，二分查找起始行不大于小节起始行的最后一个章节
+        chapter_starts = [chapter.start_line for chapter in self.chapters]
         for section in self.sections:
-            for chapter in self.chapters:
-                if (chapter.start_line <= section.start_line <= chapter.end_line):
-                    chapter.add_section(section)
-                    section.chapter_title = chapter.title
-                    break
-    
-    def _find_chapter_by_line(self, line_num: int) -> Optional[ChapterInfo]:
-        """根据行号查找对应的章节"""
-        for chapter in self.chapters:
-            if chapter.start_line == line_num:
-                return chapter
-        return None
+            idx = bisect_right(chapter_starts, section.start_line) - 1
+            if idx < 0:
+                continue
+            chapter = self.chapters[idx]
+            if section.start_line <= chapter.end_line:
+                chapter.add_section(section)
+                section.chapter_title = chapter.title
     
     def _extract_chapter_number(self, line: str) -> str:
         """从章节标题行提取章节号"""
-        match = re.search(r'第([一二三四五六七八九十0-9]+)章', line)
+        match = self._CHAPTER_NUMBER_RE.search(line)
         return match.group(1) if match else "未知"
     
     def get_statistics(self) -> Dict[str, any]:
         """获取分析统计信息"""
+        # 单次遍历统计各级小节数量，而不是每个级别各扫描一遍
+        level_counts = Counter(section.level for section in self.sections)
         return {
-            'total_lines': len(self._lines),
+            'total_lines': self._total_lines,
             'chapters_count': len(self.chapters),
             'sections_count': len(self.sections),
             'sections_by_level': {
-                level: len([s for s in self.sections if s.level == level])
-                for level in self.SECTION_PATTERNS.keys()
+                level: level_counts[level] for level in self.SECTION_PATTERNS
             },
             'chapters_with_sections': len([c for c in self.chapters if c.has_sections]),
             'average_chapter_length': (
@@ -250,24 +302,31 @@ class StructureAnalyzer:
             发现的问题列表
         """
         issues = []
+        sorted_chapters = sorted(self.chapters, key=lambda c: c.start_line)
         
-        # 检查章节重叠
-        for i, chapter in enumerate(self.chapters):
-            for j, other_chapter in enumerate(self.chapters):
-                if i != j and self._ranges_overlap(
+        # 检查章节重叠：按起始行排序后，只需向后比较起始行不超过当前结束行的章节
+        for i, chapter in enumerate(sorted_chapters):
+            for j in range(i + 1, len(sorted_chapters)):
+                other_chapter = sorted_chapters[j]
+                if not self._ranges_overlap(
                     (chapter.start_line, chapter.end_line),
                     (other_chapter.start_line, other_chapter.end_line)
                 ):
-                    issues.append(f"章节重叠: {chapter.title} 和 {other_chapter.title}")
+                    break
+                issues.append(f"章节重叠: {chapter.title} 和 {other_chapter.title}")
+        
+        # 检查小节是否在章节范围内：二分查找起始行不大于小节起始行的章节，
+        # 再用结束行的前缀最大值判断其中是否有章节覆盖该小节
+        chapter_starts = [c.start_line for c in sorted_chapters]
+        max_end_lines = []
+        max_end_line = 0
+        for chapter in sorted_chapters:
+            max_end_line = max(max_end_line, chapter.end_line)
+            max_end_lines.append(max_end_line)
         
-        # 检查小节是否在章节范围内
         for section in self.sections:
-            found_chapter = False
-            for chapter in self.chapters:
-                if chapter.start_line <= section.start_line <= chapter.end_line:
-                    found_chapter = True
-                    break
-            if not found_chapter:
+            idx = bisect_right(chapter_starts, section.start_line) - 1
+            if idx < 0 or max_end_lines[idx] < section.start_line:
                 issues.append(f"小节不在任何章节范围内: {section.title}")
         
         # 检查空章节
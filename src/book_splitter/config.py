@@ -6,11 +6,53 @@
 
 # 模块导入区
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-import yaml
 import json
 
+# 配置文件扩展名到格式的映射
+_CONFIG_FORMATS = {
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.json': 'json'
+}
+
+
+@lru_cache(maxsize=64)
+def _join_path(base_dir: str, name: str) -> str:
+    """拼接并缓存输出路径字符串，避免每次访问都重新构造 Path 对象
+    
+    同一时刻只有少数几组 (输出目录, 子目录) 在使用，缓存设上限，
+    长时间运行或批量处理时不会随已弃用的配置无限增长。
+    """
+    return str(Path(base_dir) / name)
+
+
+def _load_config_data(config_path: str, config_format: Optional[str]) -> dict:
+    """读取并解析配置文件
+    
+    Args:
+        config_path: 配置文件路径
+        config_format: 'yaml'、'json'，或 None 表示根据内容判断
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    if config_format == 'json':
+        return json.loads(text)
+    
+    if config_format is None and text.lstrip().startswith('{'):
+        # 未知扩展名且以 '{' 开头：先按 JSON 解析，失败时（如 YAML 流式映射）再按 YAML 解析
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    
+    # 仅在确实需要解析 YAML 时才导入 yaml
+    import yaml
+    return yaml.safe_load(text)
+
 
 @dataclass
 class ProcessingConfig:
@@ -30,6 +72,7 @@ class ProcessingConfig:
     # 标签生成配置
     max_tags_per_section: int = 8
     min_tags_per_section: int = 3
+    use_textrank: bool = True  # 关闭后只用TF-IDF提取关键词，标签生成更快
     
     # 文件名配置
     chapter_prefix: str = "第"
@@ -41,18 +84,28 @@ class ProcessingConfig:
     sections_subdir: str = "sections"
     images_subdir: str = "images"
     
+    # 性能配置
+    write_workers: int = 4  # 并发写入文件的线程数，1 表示同步写入
+    tag_workers: int = 1  # 并行生成标签的进程数，1 表示在主进程中顺序生成
+    
     @classmethod
-    def from_yaml(cls, config_path: str) -> 'ProcessingConfig':
-        """从YAML文件加载配置"""
+    def _from_config_file(cls, config_path: str, config_format: Optional[str]) -> 'ProcessingConfig':
+        """从配置文件加载配置"""
         config_file = Path(config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        config_data = _load_config_data(config_path, config_format)
         return cls(**config_data)
     
+    @classmethod
+    def from_yaml(cls, config_path: str) -> 'ProcessingConfig':
+        """从YAML文件加载配置"""
+        return cls._from_config_file(config_path, 'yaml')
+    
     def to_yaml(self, config_path: str):
         """保存配置到YAML文件"""
+        import yaml
+        
         config_data = {
             'source_file': self.source_file,
             'output_dir': self.output_dir,
@@ -63,12 +116,15 @@ class ProcessingConfig:
             'generate_tags': self.generate_tags,
             'max_tags_per_section': self.max_tags_per_section,
             'min_tags_per_section': self.min_tags_per_section,
+            'use_textrank': self.use_textrank,
             'chapter_prefix': self.chapter_prefix,
             'section_prefix': self.section_prefix,
             'filename_separator': self.filename_separator,
             'chapters_subdir': self.chapters_subdir,
             'sections_subdir': self.sections_subdir,
-            'images_subdir': self.images_subdir
+            'images_subdir': self.images_subdir,
+            'write_workers': self.write_workers,
+            'tag_workers': self.tag_workers
         }
         
         with open(config_path, 'w', encoding='utf-8') as f:
@@ -77,22 +133,22 @@ class ProcessingConfig:
     @property
     def chapters_dir(self) -> str:
         """获取章节目录路径"""
-        return str(Path(self.output_dir) / self.chapters_subdir)
+        return _join_path(self.output_dir, self.chapters_subdir)
     
     @property
     def sections_dir(self) -> str:
         """获取小节目录路径"""
-        return str(Path(self.output_dir) / self.sections_subdir)
+        return _join_path(self.output_dir, self.sections_subdir)
     
     @property
     def images_dir(self) -> str:
         """获取图片目录路径"""
-        return str(Path(self.output_dir) / self.images_subdir)
+        return _join_path(self.output_dir, self.images_subdir)
     
     @property
     def toc_path(self) -> str:
         """获取目录文件路径"""
-        return str(Path(self.output_dir) / self.toc_filename)
+        return _join_path(self.output_dir, self.toc_filename)
     
     def validate(self):
         """验证配置的有效性"""
@@ -107,28 +163,23 @@ class ProcessingConfig:
         
         if self.min_tags_per_section < 0:
             raise ValueError("最小标签数不能为负数")
+        
+        if self.write_workers < 1:
+            raise ValueError("写入线程数必须大于0")
+        
+        if self.tag_workers < 1:
+            raise ValueError("标签生成进程数必须大于0")
     
     @classmethod
     def from_json(cls, config_path: str) -> 'ProcessingConfig':
         """从JSON文件加载配置"""
-        config_file = Path(config_path)
-        if not config_file.exists():
-            raise FileNotFoundError(f"配置文件不存在: {config_path}")
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        return cls(**config_data)
+        return cls._from_config_file(config_path, 'json')
 
     @classmethod
     def from_file(cls, config_path: str) -> 'ProcessingConfig':
-        """根据扩展名自动从文件加载配置（支持 YAML/JSON）"""
-        ext = Path(config_path).suffix.lower()
-        if ext in ['.yaml', '.yml']:
-            return cls.from_yaml(config_path)
-        elif ext == '.json':
-            return cls.from_json(config_path)
-        else:
-            # 优雅降级：先尝试 YAML，再尝试 JSON
-            try:
-                return cls.from_yaml(config_path)
-            except Exception:
-                return cls.from_json(config_path)
\ No newline at end of file
+        """根据扩展名自动从文件加载配置（支持 YAML/JSON）
+        
+        扩展名未知时根据文件内容判断格式，只读取和解析一次。
+        """
+        config_format = _CONFIG_FORMATS.get(Path(config_path).suffix.lower())
+        return cls._from_config_file(config_path, config_format)
\ No newline at end of file
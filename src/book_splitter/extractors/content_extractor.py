@@ -4,6 +4,8 @@
 基于行号范围从源文档提取特定章节和小节内容，保持原始markdown格式。
 """
 
+import os
+import re
 import logging
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
@@ -14,6 +16,10 @@ from ..models import ChapterInfo, SectionInfo
 class ContentExtractor:
     """内容提取器"""
     
+    _NEWLINE_RE = re.compile('\n')
+    # 除 '\n' 外 str.splitlines() 也视为行边界的字符
+    _OTHER_LINE_BREAKS_RE = re.compile('[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+    
     def __init__(self, source_file: str):
         """初始化内容提取器
         
@@ -23,28 +29,61 @@ class ContentExtractor:
         self.source_file = source_file
         self.logger = logging.getLogger(__name__)
         
-        # 缓存文件内容以避免重复读取
-        self._lines_cache: Optional[List[str]] = None
+        # 缓存文件全文及行起始偏移索引，避免重复读取和逐行切分
+        self._text: Optional[str] = None
+        self._line_starts: Optional[List[int]] = None
+        self._file_size: Optional[int] = None
         
         # 验证源文件存在
         if not Path(source_file).exists():
             raise FileNotFoundError(f"源文件不存在: {source_file}")
     
-    def _load_file_content(self) -> List[str]:
+    def _load_file_content(self) -> int:
         """加载文件内容到缓存
         
         Returns:
-            文件行列表
+            文件总行数
         """
-        if self._lines_cache is None:
+        if self._line_starts is None:
             try:
                 with open(self.source_file, 'r', encoding='utf-8') as f:
-                    self._lines_cache = f.readlines()
-                self.logger.debug(f"加载文件内容完成，共 {len(self._lines_cache)} 行")
+                    self._file_size = os.fstat(f.fileno()).st_size
+                    self._set_text(f.read())
+                self.logger.debug(f"加载文件内容完成，共 {self._line_count()} 行")
             except Exception as e:
                 raise IOError(f"读取文件失败: {str(e)}")
         
-        return self._lines_cache
+        return self._line_count()
+    
+    def _set_text(self, text: str):
+        """缓存全文并建立行起始偏移索引
+        
+        _line_starts[i] 为第 i+1 行在全文中的起始偏移，末尾追加全文长度作为哨兵，
+        因此第 s 至 e 行的内容即 text[_line_starts[s-1]:_line_starts[e]]。
+        行只按 '\n' 划分，与文件对象的 readlines() 结果一致。
+        """
+        line_starts = [0]
+        line_starts.extend(m.end() for m in self._NEWLINE_RE.finditer(text))
+        # 最后一行没有换行符时同样计为一行
+        if line_starts[-1] != len(text):
+            line_starts.append(len(text))
+        self._text = text
+        self._line_starts = line_starts
+    
+    def _line_count(self) -> int:
+        """已缓存内容的总行数"""
+        return len(self._line_starts) - 1
+    
+    def load_source_text(self, text: str):
+        """使用已读取的源文件文本填充缓存
+        
+        结构分析阶段已经读取并解码过源文件时调用，避免再次读取同一文件。
+        
+        Args:
+            text: 源文件全文（与以文本模式读取的内容一致）
+        """
+        self._set_text(text)
+        self.logger.debug(f"复用已读取的源文件文本，共 {self._line_count()} 行")
     
     def extract_content(self, start_line: int, end_line: int) -> str:
         """提取指定行范围的内容
@@ -56,28 +95,47 @@ class ContentExtractor:
         Returns:
             提取的内容字符串
         """
-        lines = self._load_file_content()
+        self._load_file_content()
+        
+        content = self._slice_lines(start_line, end_line)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"提取内容: 行 {start_line}-{end_line} ({end_line - start_line + 1} 行)")
+        
+        return content
+    
+    def _slice_lines(self, start_line: int, end_line: int) -> str:
+        """校验行号范围并从已缓存的全文中切片（调用前须已加载文件内容）"""
+        total_lines = self._line_count()
         
         # 验证行号范围
         if start_line < 1 or end_line < 1:
             raise ValueError("行号必须大于0")
         
-        if start_line > len(lines) or end_line > len(lines):
-            raise ValueError(f"行号超出文件范围 (1-{len(lines)})")
+        if start_line > total_lines or end_line > total_lines:
+            raise ValueError(f"行号超出文件范围 (1-{total_lines})")
         
         if start_line > end_line:
             raise ValueError("起始行号不能大于结束行号")
         
-        # 提取内容（转换为0-based索引）
-        start_idx = start_line - 1
-        end_idx = end_line  # end_line是包含的，所以不需要-1
+        # 按行起始偏移直接切片全文（end_line是包含的，其结束位置即下一行的起始偏移）
+        return self._text[self._line_starts[start_line - 1]:self._line_starts[end_line]]
+    
+    def _extract_items_batch(self, items: List, kind: str) -> Dict[str, str]:
+        """按章节/小节对象批量提取内容，键为标题
         
-        extracted_lines = lines[start_idx:end_idx]
-        content = ''.join(extracted_lines)
+        直接按对象的行号范围切片，不经过 "start-end" 形式的中间字典。
+        """
+        self._load_file_content()
         
-        self.logger.debug(f"提取内容: 行 {start_line}-{end_line} ({len(extracted_lines)} 行)")
+        results = {}
+        for item in items:
+            try:
+                results[item.title] = self._slice_lines(item.start_line, item.end_line)
+            except ValueError as e:
+                self.logger.warning(f"{kind} '{item.title}' 内容提取失败: {str(e)}")
         
-        return content
+        return results
     
     def extract_multiple_ranges(self, ranges: List[Tuple[int, int]]) -> Dict[str, str]:
         """批量提取多个行范围的内容
@@ -98,12 +156,9 @@ class ContentExtractor:
         
         for start_line, end_line in ranges:
             try:
-                content = self.extract_content(start_line, end_line)
-                key = f"{start_line}-{end_line}"
-                results[key] = content
-            except Exception as e:
+                results[f"{start_line}-{end_line}"] = self._slice_lines(start_line, end_line)
+            except ValueError as e:
                 self.logger.warning(f"提取范围 {start_line}-{end_line} 失败: {str(e)}")
-                continue
         
         self.logger.info(f"批量提取完成，成功提取 {len(results)}/{len(ranges)} 个范围")
         
@@ -120,7 +175,8 @@ class ContentExtractor:
         """
         try:
             content = self.extract_content(chapter.start_line, chapter.end_line)
-            self.logger.debug(f"提取章节内容: {chapter.title}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"提取章节内容: {chapter.title}")
             return content
         except Exception as e:
             self.logger.error(f"提取章节 '{chapter.title}' 内容失败: {str(e)}")
@@ -137,7 +193,8 @@ class ContentExtractor:
         """
         try:
             content = self.extract_content(section.start_line, section.end_line)
-            self.logger.debug(f"提取小节内容: {section.title}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"提取小节内容: {section.title}")
             return content
         except Exception as e:
             self.logger.error(f"提取小节 '{section.title}' 内容失败: {str(e)}")
@@ -155,20 +212,7 @@ class ContentExtractor:
         if not chapters:
             return {}
         
-        # 准备行号范围列表
-        ranges = [(chapter.start_line, chapter.end_line) for chapter in chapters]
-        
-        # 批量提取
-        range_contents = self.extract_multiple_ranges(ranges)
-        
-        # 映射到章节标题
-        results = {}
-        for chapter in chapters:
-            range_key = f"{chapter.start_line}-{chapter.end_line}"
-            if range_key in range_contents:
-                results[chapter.title] = range_contents[range_key]
-            else:
-                self.logger.warning(f"章节 '{chapter.title}' 内容提取失败")
+        results = self._extract_items_batch(chapters, "章节")
         
         self.logger.info(f"批量提取章节完成，成功提取 {len(results)}/{len(chapters)} 个章节")
         
@@ -186,20 +230,7 @@ class ContentExtractor:
         if not sections:
             return {}
         
-        # 准备行号范围列表
-        ranges = [(section.start_line, section.end_line) for section in sections]
-        
-        # 批量提取
-        range_contents = self.extract_multiple_ranges(ranges)
-        
-        # 映射到小节标题
-        results = {}
-        for section in sections:
-            range_key = f"{section.start_line}-{section.end_line}"
-            if range_key in range_contents:
-                results[section.title] = range_contents[range_key]
-            else:
-                self.logger.warning(f"小节 '{section.title}' 内容提取失败")
+        results = self._extract_items_batch(sections, "小节")
         
         self.logger.info(f"批量提取小节完成，成功提取 {len(results)}/{len(sections)} 个小节")
         
@@ -217,28 +248,26 @@ class ContentExtractor:
         Returns:
             包含 'content', 'before_context', 'after_context' 的字典
         """
-        lines = self._load_file_content()
-        
-        # 计算上下文范围
-        context_start = max(1, start_line - context_lines)
-        context_end = min(len(lines), end_line + context_lines)
+        total_lines = self._load_file_content()
         
-        # 提取各部分内容
-        before_context = ""
-        if context_start < start_line:
-            before_context = self.extract_content(context_start, start_line - 1)
+        # 只需校验主体范围，上下文范围由其推出；各部分直接按行偏移切片
+        main_content = self._slice_lines(start_line, end_line)
         
-        main_content = self.extract_content(start_line, end_line)
+        # 计算上下文范围（至少覆盖主体范围）
+        context_start = min(start_line, max(1, start_line - context_lines))
+        context_end = max(end_line, min(total_lines, end_line + context_lines))
         
-        after_context = ""
-        if end_line < context_end:
-            after_context = self.extract_content(end_line + 1, context_end)
+        text = self._text
+        line_starts = self._line_starts
+        before_context = text[line_starts[context_start - 1]:line_starts[start_line - 1]]
+        after_context = text[line_starts[end_line]:line_starts[context_end]]
         
         return {
             'content': main_content,
             'before_context': before_context,
             'after_context': after_context,
-            'full_context': before_context + main_content + after_context
+            # 完整上下文是一段连续文本，同样一次切片得到
+            'full_context': text[line_starts[context_start - 1]:line_starts[context_end]]
         }
     
     def validate_content_integrity(self, content: str, expected_lines: int = None) -> bool:
@@ -260,7 +289,11 @@ class ContentExtractor:
         
         # 如果指定了期望行数，验证行数
         if expected_lines is not None:
-            actual_lines = len(content.splitlines())
+            if self._OTHER_LINE_BREAKS_RE.search(content):
+                actual_lines = len(content.splitlines())
+            else:
+                # 只有 '\n' 换行时直接计数，不必构造行列表；末行无换行符时同样计为一行
+                actual_lines = content.count('\n') + (not content.endswith('\n'))
             if actual_lines != expected_lines:
                 self.logger.warning(f"行数不匹配: 期望 {expected_lines}，实际 {actual_lines}")
                 return False
@@ -273,17 +306,23 @@ class ContentExtractor:
         Returns:
             统计信息字典
         """
-        lines = self._load_file_content()
+        total_lines = self._load_file_content()
+        
+        # 文件大小只查询一次（复用分析阶段的文本时没有打开过文件）
+        if self._file_size is None:
+            self._file_size = Path(self.source_file).stat().st_size
         
         return {
             'source_file': self.source_file,
-            'total_lines': len(lines),
-            'file_size_bytes': Path(self.source_file).stat().st_size,
-            'cache_loaded': self._lines_cache is not None,
+            'total_lines': total_lines,
+            'file_size_bytes': self._file_size,
+            'cache_loaded': self._line_starts is not None,
             'encoding': 'utf-8'
         }
     
     def clear_cache(self):
         """清除文件内容缓存"""
-        self._lines_cache = None
+        self._text = None
+        self._line_starts = None
+        self._file_size = None
         self.logger.debug("文件内容缓存已清除")
\ No newline at end of file
@@ -4,19 +4,72 @@
 负责创建章节和小节的markdown文件，处理文件名规范化和目录结构管理。
 """
 
+import os
 import re
+import shutil
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Pattern, Set, Tuple, Union
 import unicodedata
 
 from ..models import ChapterInfo, SectionInfo
 from ..config import ProcessingConfig
+from .tag_generator import TagGenerator
+
+
+def _build_chinese_numbers() -> Dict[str, int]:
+    """生成"一"到"九十九"的中文数字映射"""
+    digits = '一二三四五六七八九'
+    numbers = {'十': 10}
+    for unit, digit in enumerate(digits, 1):
+        numbers[digit] = unit
+        numbers['十' + digit] = 10 + unit
+    for tens, tens_digit in enumerate(digits[1:], 2):
+        numbers[tens_digit + '十'] = tens * 10
+        for unit, digit in enumerate(digits, 1):
+            numbers[tens_digit + '十' + digit] = tens * 10 + unit
+    return numbers
 
 
 class FileGenerator:
     """文件生成器"""
     
+    # 预编译的正则表达式（每个进程只编译一次）
+    # markdown标记：标题符号、粗体、斜体、行内代码
+    # 每项为 (标记字符, 正则, 替换)，标题中不含该标记字符时跳过对应的替换
+    _MARKDOWN_RES = (
+        ('#', re.compile(r'#+\s*'), ''),
+        ('*', re.compile(r'\*\*(.+?)\*\*'), r'\1'),
+        ('*', re.compile(r'\*(.+?)\*'), r'\1'),
+        ('`', re.compile(r'`(.+?)`'), r'\1'),
+    )
+    # 章节编号前缀（如"第一章"、"第1节"、"一、"、"(一)"）
+    _NUMBER_PREFIX_RES = (
+        re.compile(r'^第[一二三四五六七八九十\d]+章\s*'),
+        re.compile(r'^第[一二三四五六七八九十\d]+节\s*'),
+        re.compile(r'^[一二三四五六七八九十\d]+、\s*'),
+        re.compile(r'^\([一二三四五六七八九十\d]+\)\s*'),
+    )
+    _UNSAFE_CHARS_RE = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9\s\-_]')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _CHAPTER_TITLE_RE = re.compile(r'^(第[一二三四五六七八九十\d]+章)\s*(.*)$')
+    _CHAPTER_NUMBER_RE = re.compile(r'第([一二三四五六七八九十\d]+)章')
+    # 小节编号格式：一、标题 | 1、标题 | (一)标题 | (1)标题
+    # 第1-4组中恰有一组为编号，第5组为标题
+    _SECTION_TITLE_RE = re.compile(
+        r'^(?:([一二三四五六七八九十]+)、|(\d+)、'
+        r'|\(([一二三四五六七八九十]+)\)|\((\d+)\))\s*(.*)$'
+    )
+    # 在未 strip 的内容上判断开头是否为标题，避免为此复制整段正文：
+    # 前者等价于 content.strip().startswith('#')，后者等价于 ^#{1,6}\s+ 匹配 content.strip()
+    _LEADING_HASH_RE = re.compile(r'\s*#')
+    _HEADING_MARK_RE = re.compile(r'\s*#{1,6}\s+\S')
+    _IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+    
+    # 中文数字映射（一 ~ 九十九）
+    _CHINESE_NUMBERS = _build_chinese_numbers()
+    
     def __init__(self, config: ProcessingConfig):
         """初始化文件生成器
         
@@ -32,8 +85,48 @@ class FileGenerator:
         # 已生成的文件路径记录
         self._generated_files: List[str] = []
         
+        # 生成时已写入导航链接的文件路径
+        self._navigated_files: Set[str] = set()
+        
+        # 章节标题 -> 章节编号缓存（同一章节下的每个小节都需要查询一次）
+        self._chapter_number_cache: Dict[str, int] = {}
+        
+        # 已确认存在的输出目录，避免每个文件都重复 mkdir
+        self._created_dirs: Set[str] = set()
+        
+        # (输出目录, 子目录名) -> 已创建的子目录路径
+        self._subdir_paths: Dict[Tuple[str, str], Path] = {}
+        
+        # (输出目录, 源图片绝对路径) -> 已复制图片的相对路径（同一图片在同一输出目录只复制一次）
+        self._copied_images: Dict[Tuple[str, str], str] = {}
+        
+        # 批量写入时使用的后台线程池及尚未完成的写入任务（文件路径, 任务, 对应的章节/小节信息）
+        self._write_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Tuple[str, Future, Union[ChapterInfo, SectionInfo]]] = []
+        
+        # 分隔符 -> 匹配连续分隔符的已编译正则（配置可在运行中修改，故按分隔符缓存）
+        self._separator_run_res: Dict[str, Pattern[str]] = {}
+        
+        # 生成前置元数据用的标签生成器，首次需要时创建
+        self._tag_generator: Optional[TagGenerator] = None
+        
         self.logger.info(f"文件生成器初始化完成，输出目录: {config.output_dir}")
     
+    def _strip_markdown(self, text: str) -> str:
+        """移除标题中的markdown标记"""
+        for marker, pattern, repl in self._MARKDOWN_RES:
+            if marker in text:
+                text = pattern.sub(repl, text)
+        return text
+    
+    def _collapse_separators(self, filename: str, separator: str) -> str:
+        """将连续的分隔符合并为一个"""
+        pattern = self._separator_run_res.get(separator)
+        if pattern is None:
+            pattern = re.compile(f'{re.escape(separator)}+')
+            self._separator_run_res[separator] = pattern
+        return pattern.sub(separator, filename)
+    
     def sanitize_filename(self, title: str, max_length: int = 100) -> str:
         """清理文件名，确保文件系统安全
         
@@ -48,29 +141,24 @@ class FileGenerator:
             return "untitled"
         
         # 移除markdown标记
-        filename = re.sub(r'#+\s*', '', title)
-        filename = re.sub(r'\*\*(.+?)\*\*', r'\1', filename)
-        filename = re.sub(r'\*(.+?)\*', r'\1', filename)
-        filename = re.sub(r'`(.+?)`', r'\1', filename)
+        filename = self._strip_markdown(title)
         
         # 移除章节编号前缀（如"第一章"、"第1章"等）
-        filename = re.sub(r'^第[一二三四五六七八九十\d]+章\s*', '', filename)
-        filename = re.sub(r'^第[一二三四五六七八九十\d]+节\s*', '', filename)
-        filename = re.sub(r'^[一二三四五六七八九十\d]+、\s*', '', filename)
-        filename = re.sub(r'^\([一二三四五六七八九十\d]+\)\s*', '', filename)
+        for pattern in self._NUMBER_PREFIX_RES:
+            filename = pattern.sub('', filename)
         
         # 移除特殊字符，保留中文、英文、数字、空格、连字符、下划线
-        filename = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9\s\-_]', '', filename)
+        filename = self._UNSAFE_CHARS_RE.sub('', filename)
         
         # 规范化Unicode字符
         filename = unicodedata.normalize('NFKC', filename)
         
         # 替换空格为下划线或连字符
         separator = self.config.filename_separator
-        filename = re.sub(r'\s+', separator, filename.strip())
+        filename = self._WHITESPACE_RE.sub(separator, filename.strip())
         
         # 移除连续的分隔符
-        filename = re.sub(f'{re.escape(separator)}+', separator, filename)
+        filename = self._collapse_separators(filename, separator)
         
         # 移除开头和结尾的分隔符
         filename = filename.strip(separator)
@@ -92,7 +180,8 @@ class FileGenerator:
         if filename and not (filename[0].isalnum() or ord(filename[0]) >= 0x4e00):
             filename = "file" + separator + filename
         
-        self.logger.debug(f"文件名清理: '{title}' -> '{filename}'")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"文件名清理: '{title}' -> '{filename}'")
         return filename
     
     def _create_chapter_filename(self, title: str) -> str:
@@ -108,13 +197,10 @@ class FileGenerator:
             return "untitled"
         
         # 移除markdown标记
-        clean_title = re.sub(r'#+\s*', '', title)
-        clean_title = re.sub(r'\*\*(.+?)\*\*', r'\1', clean_title)
-        clean_title = re.sub(r'\*(.+?)\*', r'\1', clean_title)
-        clean_title = re.sub(r'`(.+?)`', r'\1', clean_title)
+        clean_title = self._strip_markdown(title)
         
         # 提取章节编号和标题
-        chapter_match = re.match(r'^(第[一二三四五六七八九十\d]+章)\s*(.*)$', clean_title)
+        chapter_match = self._CHAPTER_TITLE_RE.match(clean_title)
         if chapter_match:
             chapter_num = chapter_match.group(1)
             chapter_title = chapter_match.group(2).strip()
@@ -146,10 +232,7 @@ class FileGenerator:
             return "untitled"
         
         # 移除markdown标记
-        clean_title = re.sub(r'#+\s*', '', title)
-        clean_title = re.sub(r'\*\*(.+?)\*\*', r'\1', clean_title)
-        clean_title = re.sub(r'\*(.+?)\*', r'\1', clean_title)
-        clean_title = re.sub(r'`(.+?)`', r'\1', clean_title)
+        clean_title = self._strip_markdown(title)
         
         # 如果提供了章节和小节编号，使用 X.Y 格式
         if chapter_num > 0 and section_num > 0:
@@ -157,27 +240,19 @@ class FileGenerator:
             return self._clean_filename(filename)
         
         # 尝试从标题中提取编号（备用方案）
-        section_patterns = [
-            r'^([一二三四五六七八九十]+)、\s*(.*)$',  # 一、标题
-            r'^(\d+)、\s*(.*)$',                      # 1、标题
-            r'^\(([一二三四五六七八九十]+)\)\s*(.*)$', # (一)标题
-            r'^\((\d+)\)\s*(.*)$',                    # (1)标题
-        ]
-        
-        for pattern in section_patterns:
-            match = re.match(pattern, clean_title)
-            if match:
-                section_num = match.group(1)
-                section_title = match.group(2).strip()
-                if section_title:
-                    # 格式: X.Y_标题
-                    section_num_arabic = self._chinese_to_arabic(section_num)
-                    filename = f"{chapter_num}.{section_num_arabic}_{section_title}"
-                else:
-                    # 只有小节编号
-                    section_num_arabic = self._chinese_to_arabic(section_num)
-                    filename = f"{chapter_num}.{section_num_arabic}"
-                return self._clean_filename(filename)
+        match = self._SECTION_TITLE_RE.match(clean_title)
+        if match:
+            section_num = match.group(1) or match.group(2) or match.group(3) or match.group(4)
+            section_title = match.group(5).strip()
+            if section_title:
+                # 格式: X.Y_标题
+                section_num_arabic = self._chinese_to_arabic(section_num)
+                filename = f"{chapter_num}.{section_num_arabic}_{section_title}"
+            else:
+                # 只有小节编号
+                section_num_arabic = self._chinese_to_arabic(section_num)
+                filename = f"{chapter_num}.{section_num_arabic}"
+            return self._clean_filename(filename)
         
         # 没有标准格式，直接使用标题
         return self._clean_filename(clean_title)
@@ -191,23 +266,15 @@ class FileGenerator:
         Returns:
             对应的阿拉伯数字
         """
-        chinese_map = {
-            '一': 1, '二': 2, '三': 3, '四': 4, '五': 5,
-            '六': 6, '七': 7, '八': 8, '九': 9, '十': 10
-        }
+        # 中文数字直接查表
+        number = self._CHINESE_NUMBERS.get(chinese_num)
+        if number is not None:
+            return number
         
         # 如果已经是阿拉伯数字，直接返回
         if chinese_num.isdigit():
             return int(chinese_num)
         
-        # 处理简单的中文数字
-        if chinese_num in chinese_map:
-            return chinese_map[chinese_num]
-        
-        # 处理十几的情况（如：十一、十二等）
-        if chinese_num.startswith('十') and len(chinese_num) == 2:
-            return 10 + chinese_map.get(chinese_num[1], 0)
-        
         # 默认返回1
         return 1
     
@@ -223,13 +290,14 @@ class FileGenerator:
         if not chapter_title:
             return 1
         
-        # 匹配"第X章"格式
-        match = re.search(r'第([一二三四五六七八九十\d]+)章', chapter_title)
-        if match:
-            chapter_num_str = match.group(1)
-            return self._chinese_to_arabic(chapter_num_str)
+        chapter_num = self._chapter_number_cache.get(chapter_title)
+        if chapter_num is None:
+            # 匹配"第X章"格式
+            match = self._CHAPTER_NUMBER_RE.search(chapter_title)
+            chapter_num = self._chinese_to_arabic(match.group(1)) if match else 1
+            self._chapter_number_cache[chapter_title] = chapter_num
         
-        return 1
+        return chapter_num
     
     def _clean_filename(self, filename: str) -> str:
         """清理文件名，移除特殊字符
@@ -247,14 +315,14 @@ class FileGenerator:
         filename = unicodedata.normalize('NFKC', filename)
         
         # 移除特殊字符，保留中文、英文、数字、空格、连字符、下划线
-        filename = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9\s\-_]', '', filename)
+        filename = self._UNSAFE_CHARS_RE.sub('', filename)
         
         # 替换空格为下划线或连字符
         separator = self.config.filename_separator
-        filename = re.sub(r'\s+', separator, filename.strip())
+        filename = self._WHITESPACE_RE.sub(separator, filename.strip())
         
         # 移除连续的分隔符
-        filename = re.sub(f'{re.escape(separator)}+', separator, filename)
+        filename = self._collapse_separators(filename, separator)
         
         # 移除开头和结尾的分隔符
         filename = filename.strip(separator)
@@ -288,20 +356,22 @@ class FileGenerator:
             唯一的文件名
         """
         full_filename = base_filename + extension
+        counters = self._filename_counters
         
         # 如果文件名未使用过，直接返回
-        if full_filename not in self._filename_counters:
-            self._filename_counters[full_filename] = 1
+        counter = counters.get(full_filename)
+        if counter is None:
+            counters[full_filename] = 1
             return full_filename
         
-        # 如果已使用，添加数字后缀
-        counter = self._filename_counters[full_filename]
+        # 如果已使用，从上次使用的后缀继续递增；
+        # 跳过已被其他标题占用的名称（如原标题本身就是"xxx_2"）
         while True:
             counter += 1
             new_filename = f"{base_filename}_{counter}{extension}"
-            if new_filename not in self._filename_counters:
-                self._filename_counters[full_filename] = counter
-                self._filename_counters[new_filename] = 1
+            if new_filename not in counters:
+                counters[full_filename] = counter
+                counters[new_filename] = 1
                 return new_filename
     
     def _create_file_path(self, filename: str, subdirectory: str) -> Path:
@@ -314,12 +384,23 @@ class FileGenerator:
         Returns:
             完整的文件路径
         """
-        # 确保子目录存在
-        subdir_path = Path(self.config.output_dir) / subdirectory
-        subdir_path.mkdir(parents=True, exist_ok=True)
+        # 确保子目录存在（输出目录可能在运行中被修改，因此一并作为缓存键）
+        key = (self.config.output_dir, subdirectory)
+        subdir_path = self._subdir_paths.get(key)
+        if subdir_path is None:
+            subdir_path = Path(self.config.output_dir) / subdirectory
+            self._ensure_dir(subdir_path)
+            self._subdir_paths[key] = subdir_path
         
         return subdir_path / filename
     
+    def _ensure_dir(self, directory: Path):
+        """确保目录存在，同一目录只创建一次"""
+        key = str(directory)
+        if key not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(key)
+    
     def create_chapter_file(self, chapter_info: ChapterInfo, content: str, 
                           tags: Optional[List[str]] = None) -> str:
         """创建章节文件
@@ -341,22 +422,23 @@ class FileGenerator:
             file_path = self._create_file_path(filename, self.config.chapters_subdir)
             
             # 准备文件内容
-            file_content = self._prepare_chapter_content(
+            content_parts = self._prepare_chapter_content(
                 chapter_info, content, tags, file_path
             )
             
             # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(file_content)
+            self._write_file(file_path, content_parts, chapter_info)
             
             # 更新章节信息
             chapter_info.file_path = str(file_path.relative_to(self.config.output_dir))
             
             # 记录生成的文件
-            self._generated_files.append(str(file_path))
+            file_path_str = str(file_path)
+            self._generated_files.append(file_path_str)
             
-            self.logger.info(f"章节文件已创建: {file_path}")
-            return str(file_path)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"章节文件已创建: {file_path_str}")
+            return file_path_str
             
         except Exception as e:
             self.logger.error(f"创建章节文件失败 '{chapter_info.title}': {str(e)}")
@@ -388,29 +470,106 @@ class FileGenerator:
             file_path = self._create_file_path(filename, self.config.sections_subdir)
             
             # 准备文件内容
-            file_content = self._prepare_section_content(
+            content_parts = self._prepare_section_content(
                 section_info, content, tags, file_path
             )
             
             # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(file_content)
+            self._write_file(file_path, content_parts, section_info)
             
             # 更新小节信息
             section_info.file_path = str(file_path.relative_to(self.config.output_dir))
             
             # 记录生成的文件
-            self._generated_files.append(str(file_path))
+            file_path_str = str(file_path)
+            self._generated_files.append(file_path_str)
             
-            self.logger.info(f"小节文件已创建: {file_path}")
-            return str(file_path)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"小节文件已创建: {file_path_str}")
+            return file_path_str
             
         except Exception as e:
             self.logger.error(f"创建小节文件失败 '{section_info.title}': {str(e)}")
             raise
     
+    def begin_batch_writes(self):
+        """开始批量写入：此后创建的文件由后台线程写入磁盘
+        
+        文件名分配和内容准备仍在调用线程中按顺序完成，只有磁盘写入并发执行。
+        之后必须调用 finish_batch_writes() 等待写入完成；write_workers 为1时仍同步写入。
+        """
+        if self._write_executor is None and self.config.write_workers > 1:
+            self._write_executor = ThreadPoolExecutor(
+                max_workers=self.config.write_workers,
+                thread_name_prefix="file-writer"
+            )
+    
+    def finish_batch_writes(self) -> List[str]:
+        """等待所有后台写入完成并关闭线程池
+        
+        写入失败的章节/小节会清空其 file_path，目录和交叉引用不会链接到不存在的文件。
+        
+        Returns:
+            写入失败的文件路径列表（已从生成文件记录中移除）
+        """
+        failed_files = []
+        for file_path, future, info in self._pending_writes:
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"写入文件失败 '{file_path}': {str(e)}")
+                failed_files.append(file_path)
+                info.file_path = ""
+        self._pending_writes.clear()
+        
+        if self._write_executor is not None:
+            self._write_executor.shutdown()
+            self._write_executor = None
+        
+        if failed_files:
+            failed = set(failed_files)
+            self._generated_files = [path for path in self._generated_files if path not in failed]
+        
+        return failed_files
+    
+    def _write_file(self, file_path: Path, content_parts: List[str],
+                    info: Union[ChapterInfo, SectionInfo]):
+        """写入文件内容；批量写入期间提交给后台线程池"""
+        if self._write_executor is not None:
+            future = self._write_executor.submit(self._write_text, file_path, content_parts)
+            self._pending_writes.append((str(file_path), future, info))
+        else:
+            self._write_text(file_path, content_parts)
+    
+    @staticmethod
+    def _write_text(file_path: Path, content_parts: List[str]):
+        """以UTF-8编码写入由多个部分组成的文本文件，各部分之间以换行分隔
+        
+        各部分分别编码后依次以二进制方式写入，不必先拼接出完整的文件字符串，
+        正文也不经过文本层的分块编码；换行符按平台转换，与文本模式写入的结果一致。
+        """
+        newline = os.linesep
+        separator = newline.encode('utf-8')
+        with open(file_path, 'wb') as f:
+            for index, part in enumerate(content_parts):
+                if index:
+                    f.write(separator)
+                if newline != '\n':
+                    part = part.replace('\n', newline)
+                f.write(part.encode('utf-8'))
+    
+    def _get_tag_generator(self) -> TagGenerator:
+        """获取用于生成前置元数据的标签生成器（首次调用时创建并缓存）
+        
+        TagGenerator 初始化时会把领域词汇逐个加入 jieba 词典，
+        不宜为每个文件重新创建。
+        """
+        if self._tag_generator is None:
+            self._tag_generator = TagGenerator()
+        return self._tag_generator
+    
     def _prepare_chapter_content(self, chapter_info: ChapterInfo, content: str,
-                               tags: Optional[List[str]], file_path: Path) -> str:
+                               tags: Optional[List[str]], file_path: Path) -> List[str]:
         """准备章节文件内容
         
         Args:
@@ -420,14 +579,13 @@ class FileGenerator:
             file_path: 文件路径
             
         Returns:
-            完整的文件内容
+            文件内容的各个部分（写入时以换行分隔）
         """
         content_parts = []
         
         # 添加YAML前置元数据（如果启用标签生成）
         if self.config.generate_tags and tags:
-            from .tag_generator import TagGenerator
-            tag_generator = TagGenerator()
+            tag_generator = self._get_tag_generator()
             
             metadata = {
                 "type": "chapter",
@@ -444,7 +602,7 @@ class FileGenerator:
             content_parts.append(frontmatter)
         
         # 添加章节标题（如果内容中没有）
-        if not content.strip().startswith('#'):
+        if not self._LEADING_HASH_RE.match(content):
             content_parts.append(f"# {chapter_info.title}\n")
         
         # 添加主要内容
@@ -456,11 +614,12 @@ class FileGenerator:
             if navigation:
                 content_parts.append("\n---\n")
                 content_parts.append(navigation)
+                self._navigated_files.add(str(file_path))
         
-        return "\n".join(content_parts)
+        return content_parts
     
     def _prepare_section_content(self, section_info: SectionInfo, content: str,
-                               tags: Optional[List[str]], file_path: Path) -> str:
+                               tags: Optional[List[str]], file_path: Path) -> List[str]:
         """准备小节文件内容
         
         Args:
@@ -470,14 +629,13 @@ class FileGenerator:
             file_path: 文件路径
             
         Returns:
-            完整的文件内容
+            文件内容的各个部分（写入时以换行分隔）
         """
         content_parts = []
         
         # 添加YAML前置元数据（如果启用标签生成）
         if self.config.generate_tags and tags:
-            from .tag_generator import TagGenerator
-            tag_generator = TagGenerator()
+            tag_generator = self._get_tag_generator()
             
             metadata = {
                 "type": "section",
@@ -495,8 +653,7 @@ class FileGenerator:
             content_parts.append(frontmatter)
         
         # 添加小节标题（如果内容中没有合适的标题）
-        title_pattern = r'^#{1,6}\s+'
-        if not re.match(title_pattern, content.strip()):
+        if not self._HEADING_MARK_RE.match(content):
             level_marker = '#' * min(section_info.level, 6)
             content_parts.append(f"{level_marker} {section_info.title}\n")
         
@@ -509,8 +666,9 @@ class FileGenerator:
             if navigation:
                 content_parts.append("\n---\n")
                 content_parts.append(navigation)
+                self._navigated_files.add(str(file_path))
         
-        return "\n".join(content_parts)
+        return content_parts
     
     def _create_navigation_links(self, current_file: Path, file_type: str) -> str:
         """创建导航链接
@@ -547,36 +705,58 @@ class FileGenerator:
         if not self.config.preserve_images:
             return content
         
-        # 查找所有图片引用
-        image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        images = re.findall(image_pattern, content)
+        # 绝大多数内容不含图片，先用子串检查跳过正则扫描
+        if '![' not in content:
+            return content
         
-        updated_content = content
+        # 本次调用中图片路径 -> 目标路径（None 表示保留原引用）
+        targets: Dict[str, Optional[str]] = {}
         
-        for alt_text, image_path in images:
-            try:
-                # 处理相对路径
-                if not Path(image_path).is_absolute():
-                    source_image = source_dir / image_path
-                else:
-                    source_image = Path(image_path)
-                
-                if source_image.exists():
-                    # 复制图片到输出目录
-                    target_image = self._copy_image(source_image)
-                    if target_image:
-                        # 更新内容中的图片路径
-                        old_ref = f'![{alt_text}]({image_path})'
-                        new_ref = f'![{alt_text}]({target_image})'
-                        updated_content = updated_content.replace(old_ref, new_ref)
-                        
-                        self.logger.debug(f"图片路径已更新: {image_path} -> {target_image}")
-                
-            except Exception as e:
-                self.logger.warning(f"处理图片失败 '{image_path}': {str(e)}")
-                continue
+        def replace_image(match) -> str:
+            alt_text, image_path = match.groups()
+            if image_path not in targets:
+                targets[image_path] = self._resolve_image(image_path, source_dir)
+            target_image = targets[image_path]
+            if not target_image:
+                return match.group(0)
+            return f'![{alt_text}]({target_image})'
         
-        return updated_content
+        # 一次扫描完成所有图片引用的替换
+        return self._IMAGE_RE.sub(replace_image, content)
+    
+    def _resolve_image(self, image_path: str, source_dir: Path) -> Optional[str]:
+        """复制引用的图片并返回其在输出目录中的相对路径
+        
+        Args:
+            image_path: 文档中引用的图片路径
+            source_dir: 源文档目录
+            
+        Returns:
+            目标图片的相对路径，图片不存在或处理失败时返回 None
+        """
+        try:
+            # 处理相对路径
+            if not Path(image_path).is_absolute():
+                source_image = source_dir / image_path
+            else:
+                source_image = Path(image_path)
+            
+            # 章节与其小节会引用同一图片，已复制到当前输出目录的图片直接复用
+            source_key = (self.config.output_dir, str(source_image.resolve()))
+            target_image = self._copied_images.get(source_key)
+            if target_image is None and source_image.exists():
+                # 复制图片到输出目录
+                target_image = self._copy_image(source_image)
+                if target_image:
+                    self._copied_images[source_key] = target_image
+            
+            if target_image and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"图片路径已更新: {image_path} -> {target_image}")
+            return target_image
+            
+        except Exception as e:
+            self.logger.warning(f"处理图片失败 '{image_path}': {str(e)}")
+            return None
     
     def _copy_image(self, source_image: Path) -> Optional[str]:
         """复制图片文件到输出目录
@@ -588,11 +768,9 @@ class FileGenerator:
             目标图片的相对路径
         """
         try:
-            import shutil
-            
             # 创建图片目录
             images_dir = Path(self.config.output_dir) / self.config.images_subdir
-            images_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(images_dir)
             
             # 生成目标文件名
             target_filename = self.sanitize_filename(source_image.stem) + source_image.suffix
@@ -621,6 +799,10 @@ class FileGenerator:
         """获取已生成的文件列表"""
         return self._generated_files.copy()
     
+    def has_navigation(self, file_path: str) -> bool:
+        """文件在生成时是否已写入导航链接"""
+        return file_path in self._navigated_files
+    
     def get_statistics(self) -> Dict[str, any]:
         """获取文件生成统计信息"""
         return {
@@ -651,5 +833,9 @@ class FileGenerator:
                 self.logger.warning(f"删除文件失败 '{file_path}': {str(e)}")
         
         self._generated_files.clear()
+        self._navigated_files.clear()
         self._filename_counters.clear()
+        self._copied_images.clear()
+        self._created_dirs.clear()
+        self._subdir_paths.clear()
         self.logger.info("已清理所有生成的文件")
\ No newline at end of file
@@ -6,26 +6,50 @@
 
 import re
 import logging
-from typing import List, Dict, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Set, Tuple
 from collections import Counter
 import jieba
 import jieba.analyse
 
 
+# 已加入jieba词典的词汇（jieba词典为进程级共享，同一词汇只需添加一次）
+_jieba_added_terms: Set[str] = set()
+
+
 class TagGenerator:
     """标签生成器"""
     
-    def __init__(self, min_tags: int = 3, max_tags: int = 8):
+    # 预编译的正则表达式（每个进程只编译一次）
+    # markdown标记：(标记字符, 正则, 替换)，内容中不含标记字符时跳过对应的替换
+    _MARKDOWN_RES = (
+        ('#', re.compile(r'#+\s*'), ''),                  # 移除标题标记
+        ('*', re.compile(r'\*\*(.+?)\*\*'), r'\1'),       # 移除粗体标记
+        ('*', re.compile(r'\*(.+?)\*'), r'\1'),           # 移除斜体标记
+        ('`', re.compile(r'`(.+?)`'), r'\1'),             # 移除代码标记
+        ('[', re.compile(r'\[(.+?)\]\(.+?\)'), r'\1'),    # 移除链接，保留文本
+        ('![', re.compile(r'!\[.*?\]\(.+?\)'), ''),       # 移除图片
+    )
+    _NON_TEXT_RE = re.compile(r'[^\u4e00-\u9fa5a-zA-Z\s]')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _TAG_UNSAFE_RE = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9]')
+    
+    def __init__(self, min_tags: int = 3, max_tags: int = 8, use_textrank: bool = True):
         """初始化标签生成器
         
         Args:
             min_tags: 最少标签数量
             max_tags: 最多标签数量
+            use_textrank: 是否在TF-IDF之外合并TextRank结果（关闭后只用TF-IDF，速度更快）
         """
         self.min_tags = min_tags
         self.max_tags = max_tags
+        self.use_textrank = use_textrank
         self.logger = logging.getLogger(__name__)
         
+        # 分批生成标签时共用的工作进程池
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
         # 初始化停用词集合
         self.stop_words = self._load_stop_words()
         
@@ -104,9 +128,10 @@ class TagGenerator:
     
     def _setup_jieba(self):
         """配置jieba分词器"""
-        # 添加政治学词汇到jieba词典
-        for term in self.political_terms:
+        # 添加政治学词汇到jieba词典（跳过之前的实例已添加过的词汇）
+        for term in self.political_terms - _jieba_added_terms:
             jieba.add_word(term)
+            _jieba_added_terms.add(term)
         
         # 设置jieba日志级别
         jieba.setLogLevel(logging.WARNING)
@@ -133,12 +158,15 @@ class TagGenerator:
             withWeight=True
         )
         
-        # 使用TextRank提取关键词
-        textrank_keywords = jieba.analyse.textrank(
-            cleaned_content,
-            topK=self.max_tags * 2,
-            withWeight=True
-        )
+        # 使用TextRank提取关键词（需要词性标注和迭代计算，是标签生成中最耗时的部分）
+        if self.use_textrank:
+            textrank_keywords = jieba.analyse.textrank(
+                cleaned_content,
+                topK=self.max_tags * 2,
+                withWeight=True
+            )
+        else:
+            textrank_keywords = []
         
         # 合并两种算法的结果
         keyword_scores = {}
@@ -162,24 +190,22 @@ class TagGenerator:
         sorted_keywords = sorted(keyword_scores.items(), key=lambda x: x[1], reverse=True)
         keywords = [word for word, score in sorted_keywords]
         
-        self.logger.debug(f"提取到 {len(keywords)} 个关键词")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"提取到 {len(keywords)} 个关键词")
         return keywords
     
     def _clean_content(self, content: str) -> str:
         """清理文本内容"""
         # 移除markdown标记
-        content = re.sub(r'#+\s*', '', content)  # 移除标题标记
-        content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)  # 移除粗体标记
-        content = re.sub(r'\*(.+?)\*', r'\1', content)  # 移除斜体标记
-        content = re.sub(r'`(.+?)`', r'\1', content)  # 移除代码标记
-        content = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', content)  # 移除链接，保留文本
-        content = re.sub(r'!\[.*?\]\(.+?\)', '', content)  # 移除图片
+        for marker, pattern, repl in self._MARKDOWN_RES:
+            if marker in content:
+                content = pattern.sub(repl, content)
         
         # 移除特殊字符和数字
-        content = re.sub(r'[^\u4e00-\u9fa5a-zA-Z\s]', ' ', content)
+        content = self._NON_TEXT_RE.sub(' ', content)
         
         # 移除多余空白
-        content = re.sub(r'\s+', ' ', content).strip()
+        content = self._WHITESPACE_RE.sub(' ', content).strip()
         
         return content
     
@@ -254,9 +280,78 @@ class TagGenerator:
                     if len(tags) >= self.min_tags:
                         break
         
-        self.logger.debug(f"生成 {len(tags)} 个标签: {tags}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"生成 {len(tags)} 个标签: {tags}")
         return tags[:self.max_tags]  # 确保不超过最大数量
     
+    def generate_tags_batch(self, items: List[Tuple[str, str]], 
+                            workers: int = 1) -> List[Optional[List[str]]]:
+        """批量生成标签
+        
+        workers 大于1时在多个进程中并行生成（jieba分词受GIL限制，线程无法并行），
+        每个工作进程只初始化一次自己的标签生成器。
+        
+        Args:
+            items: (内容, 标题) 列表
+            workers: 工作进程数，为1时在当前进程中顺序生成
+            
+        Returns:
+            与 items 一一对应的标签列表，生成失败的项为 None
+        """
+        # begin_batch() 之后各批共用同一进程池
+        if self._executor is not None:
+            return self._generate_tags_in_pool(self._executor, items)
+        
+        if workers <= 1 or len(items) < 2:
+            results: List[Optional[List[str]]] = []
+            for content, title in items:
+                try:
+                    results.append(self.generate_tags(content, title))
+                except Exception as e:
+                    self.logger.error(f"生成标签失败 '{title}': {str(e)}")
+                    results.append(None)
+            return results
+        
+        with self._create_executor(workers) as executor:
+            return self._generate_tags_in_pool(executor, items)
+    
+    def begin_batch(self, workers: int):
+        """开始分批生成：此后的 generate_tags_batch 调用共用同一工作进程池
+        
+        工作进程只在创建进程池时初始化一次，分批调用不会重复加载jieba词典。
+        之后必须调用 finish_batch() 关闭进程池；workers 为1时不创建进程池。
+        """
+        if self._executor is None and workers > 1:
+            self._executor = self._create_executor(workers)
+    
+    def finish_batch(self):
+        """结束分批生成并关闭工作进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _create_executor(self, workers: int) -> ProcessPoolExecutor:
+        """创建标签生成工作进程池，每个工作进程初始化自己的标签生成器"""
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_tag_worker,
+            initargs=(type(self), self.min_tags, self.max_tags, self.use_textrank)
+        )
+    
+    def _generate_tags_in_pool(self, executor: ProcessPoolExecutor,
+                               items: List[Tuple[str, str]]) -> List[Optional[List[str]]]:
+        """在工作进程池中生成标签，结果与 items 一一对应，生成失败的项为 None"""
+        results: List[Optional[List[str]]] = []
+        futures = [executor.submit(_generate_tags_in_worker, content, title)
+                   for content, title in items]
+        for (content, title), future in zip(items, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                self.logger.error(f"生成标签失败 '{title}': {str(e)}")
+                results.append(None)
+        return results
+    
     def _normalize_tag(self, tag: str) -> str:
         """标准化标签格式"""
         if not tag:
@@ -267,7 +362,7 @@ class TagGenerator:
         
         # 转换为适合Obsidian的格式
         # 移除特殊字符，保留中文、英文和数字
-        tag = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9]', '', tag)
+        tag = self._TAG_UNSAFE_RE.sub('', tag)
         
         # 确保不为空
         if not tag:
@@ -480,7 +575,7 @@ class TagGenerator:
             'stop_words_count': len(self.stop_words),
             'political_terms_count': len(self.political_terms),
             'jieba_initialized': True,
-            'algorithms': ['TF-IDF', 'TextRank'],
+            'algorithms': ['TF-IDF', 'TextRank'] if self.use_textrank else ['TF-IDF'],
             'supported_features': [
                 'keyword_extraction',
                 'tag_generation', 
@@ -489,4 +584,21 @@ class TagGenerator:
                 'keyword_distribution',
                 'tag_validation'
             ]
-        }
\ No newline at end of file
+        }
+
+
+# 多进程批量生成标签时，每个工作进程持有的标签生成器
+_worker_tag_generator: Optional[TagGenerator] = None
+
+
+def _init_tag_worker(generator_class: type, min_tags: int, max_tags: int, use_textrank: bool):
+    """工作进程初始化：创建本进程的标签生成器"""
+    global _worker_tag_generator
+    _worker_tag_generator = generator_class(
+        min_tags=min_tags, max_tags=max_tags, use_textrank=use_textrank
+    )
+
+
+def _generate_tags_in_worker(content: str, title: str) -> List[str]:
+    """在工作进程中生成标签"""
+    return _worker_tag_generator.generate_tags(content, title)
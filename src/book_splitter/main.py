@@ -5,6 +5,7 @@ BookSplitter主类，整合所有组件的处理流程。
 """
 
 import logging
+from collections import Counter
 from pathlib import Path
 from typing import List, Dict, Optional
 import time
@@ -20,6 +21,9 @@ from .managers import LinkManager
 class BookSplitter:
     """书籍拆分器主控制器"""
     
+    # 多进程生成标签时每批包含的项数为 tag_workers 的倍数，每次只在内存中保留一批内容
+    _TAG_BATCH_PER_WORKER = 8
+    
     def __init__(self, config: ProcessingConfig):
         """初始化书籍拆分器
         
@@ -58,7 +62,8 @@ class BookSplitter:
             if self.config.generate_tags:
                 self.tag_generator = TagGenerator(
                     min_tags=self.config.min_tags_per_section,
-                    max_tags=self.config.max_tags_per_section
+                    max_tags=self.config.max_tags_per_section,
+                    use_textrank=self.config.use_textrank
                 )
             else:
                 self.tag_generator = None
@@ -115,6 +120,9 @@ class BookSplitter:
             if not chapters:
                 raise ValueError("未找到有效的章节结构，请检查文档格式")
             
+            # 内容提取直接复用结构分析时读取的源文本
+            self.content_extractor.load_source_text(self.structure_analyzer.get_source_text())
+            
             # 步骤2: 内容提取和文件生成
             self.logger.info("步骤2: 提取内容并生成文件...")
             generated_files = self._process_chapters_and_sections(chapters, sections)
@@ -126,7 +134,11 @@ class BookSplitter:
             # 步骤4: 添加导航链接
             if self.config.add_navigation:
                 self.logger.info("步骤4: 添加导航链接...")
-                self._add_navigation_to_files(generated_files)
+                # 文件生成时已写入导航链接的文件无需重新读取
+                self._add_navigation_to_files([
+                    path for path in generated_files
+                    if not self.file_generator.has_navigation(path)
+                ])
             
             # 步骤5: 验证结果
             self.logger.info("步骤5: 验证处理结果...")
@@ -174,32 +186,60 @@ class BookSplitter:
         Returns:
             生成的文件路径列表
         """
+        # 内容仍按顺序准备，磁盘写入交给后台线程并发完成
+        self.file_generator.begin_batch_writes()
+        try:
+            generated_files = self._generate_files(chapters, sections)
+        finally:
+            failed_files = self.file_generator.finish_batch_writes()
+        
+        if failed_files:
+            failed = set(failed_files)
+            generated_files = [path for path in generated_files if path not in failed]
+        
+        # 逐个文件的创建记录为调试日志，这里只输出一次汇总
+        self.logger.info(f"文件生成完成，共 {len(generated_files)} 个文件")
+        
+        return generated_files
+    
+    def _generate_files(self, chapters: List[ChapterInfo], 
+                        sections: List[SectionInfo]) -> List[str]:
+        """逐个提取章节和小节内容并创建文件
+        
+        Args:
+            chapters: 章节信息列表
+            sections: 小节信息列表
+            
+        Returns:
+            生成的文件路径列表
+        """
+        tags_enabled = bool(self.config.generate_tags and self.tag_generator)
+        if tags_enabled:
+            self.tag_generator.begin_batch(self.config.tag_workers)
+        try:
+            return self._create_files(chapters, sections, tags_enabled)
+        finally:
+            if tags_enabled:
+                self.tag_generator.finish_batch()
+    
+    def _create_files(self, chapters: List[ChapterInfo], sections: List[SectionInfo],
+                      tags_enabled: bool) -> List[str]:
+        """按顺序为章节和小节创建文件，返回生成的文件路径列表"""
         generated_files = []
         
         # 处理章节
         self.logger.info(f"处理 {len(chapters)} 个章节...")
-        for i, chapter in enumerate(chapters, 1):
+        for i, chapter, chapter_content, chapter_tags in self._iter_contents(
+                chapters, self.content_extractor.extract_chapter_content, tags_enabled, "章节"):
             try:
-                # 提取章节内容
-                chapter_content = self.content_extractor.extract_chapter_content(chapter)
-                
-                # 处理图片（如果启用）
-                if self.config.preserve_images:
-                    source_dir = Path(self.config.source_file).parent
-                    chapter_content = self.file_generator.process_images(chapter_content, source_dir)
-                
-                # 生成标签（如果启用）
-                chapter_tags = None
-                if self.config.generate_tags and self.tag_generator:
-                    chapter_tags = self.tag_generator.generate_tags(chapter_content, chapter.title)
-                
                 # 创建章节文件
                 chapter_file = self.file_generator.create_chapter_file(
                     chapter, chapter_content, chapter_tags
                 )
                 generated_files.append(chapter_file)
                 
-                self.logger.debug(f"章节 {i}/{len(chapters)} 处理完成: {chapter.title}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"章节 {i}/{len(chapters)} 处理完成: {chapter.title}")
                 
             except Exception as e:
                 self.logger.error(f"处理章节 '{chapter.title}' 失败: {str(e)}")
@@ -210,40 +250,29 @@ class BookSplitter:
         if self.config.create_sections and sections:
             self.logger.info(f"处理 {len(sections)} 个小节...")
             
-            # 为每个章节的小节建立索引
+            # 计算每个小节在其章节中的序号
             chapter_section_counters = {}
-            
-            for i, section in enumerate(sections, 1):
+            section_indexes = []
+            for section in sections:
+                section_index = chapter_section_counters.get(section.chapter_title, 0) + 1
+                chapter_section_counters[section.chapter_title] = section_index
+                section_indexes.append(section_index)
+            
+            for i, section, section_content, section_tags in self._iter_contents(
+                    sections, self.content_extractor.extract_section_content, tags_enabled, "小节"):
                 try:
-                    # 计算小节在其章节中的序号
-                    chapter_title = section.chapter_title
-                    if chapter_title not in chapter_section_counters:
-                        chapter_section_counters[chapter_title] = 0
-                    chapter_section_counters[chapter_title] += 1
-                    section_index = chapter_section_counters[chapter_title]
-                    
-                    # 提取小节内容
-                    section_content = self.content_extractor.extract_section_content(section)
-                    
-                    # 处理图片（如果启用）
-                    if self.config.preserve_images:
-                        source_dir = Path(self.config.source_file).parent
-                        section_content = self.file_generator.process_images(section_content, source_dir)
-                    
-                    # 生成标签（如果启用）
-                    section_tags = None
-                    if self.config.generate_tags and self.tag_generator:
-                        section_tags = self.tag_generator.generate_tags(section_content, section.title)
-                        # 更新小节的标签信息
+                    # 更新小节的标签信息
+                    if section_tags is not None:
                         section.add_tags(section_tags)
                     
                     # 创建小节文件，传递小节序号
                     section_file = self.file_generator.create_section_file(
-                        section, section_content, section_tags, section_index
+                        section, section_content, section_tags, section_indexes[i - 1]
                     )
                     generated_files.append(section_file)
                     
-                    self.logger.debug(f"小节 {i}/{len(sections)} 处理完成: {section.title}")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"小节 {i}/{len(sections)} 处理完成: {section.title}")
                     
                 except Exception as e:
                     self.logger.error(f"处理小节 '{section.title}' 失败: {str(e)}")
@@ -252,6 +281,77 @@ class BookSplitter:
         
         return generated_files
     
+    def _iter_contents(self, items: list, extract, tags_enabled: bool, label: str):
+        """按顺序提取章节或小节内容并生成标签，逐项产出 (序号, 信息, 内容, 标签)
+        
+        标签单进程生成时逐项处理，提取、生成标签与调用方创建文件交替进行；
+        多进程生成时按批处理，内存中同时只保留一批内容。
+        提取内容或生成标签失败的项记录错误后跳过。
+        
+        Args:
+            items: 章节或小节信息列表
+            extract: 对应的内容提取方法
+            tags_enabled: 是否生成标签
+            label: 日志中使用的名称（"章节"或"小节"）
+        """
+        # 图片路径相对于源文档目录解析（不处理图片时为 None）
+        source_dir = Path(self.config.source_file).parent if self.config.preserve_images else None
+        
+        batch_size = 1
+        if tags_enabled and self.config.tag_workers > 1:
+            batch_size = self.config.tag_workers * self._TAG_BATCH_PER_WORKER
+        
+        for start in range(0, len(items), batch_size):
+            batch = []
+            for i, item in enumerate(items[start:start + batch_size], start + 1):
+                try:
+                    batch.append((i, item, self._extract_content(item, extract, source_dir)))
+                except Exception as e:
+                    self.logger.error(f"处理{label} '{item.title}' 失败: {str(e)}")
+                    # 继续处理其他项
+                    continue
+            
+            tags_list = self._generate_tags_batch([(item, content) for _, item, content in batch],
+                                                  tags_enabled)
+            for (i, item, content), tags in zip(batch, tags_list):
+                # 标签生成失败的项跳过（错误已记录）
+                if tags_enabled and tags is None:
+                    continue
+                yield i, item, content, tags
+    
+    def _extract_content(self, item, extract, source_dir: Optional[Path]) -> str:
+        """提取章节或小节内容，并在启用时处理其中的图片
+        
+        Args:
+            item: 章节或小节信息
+            extract: 对应的内容提取方法
+            source_dir: 源文档目录，为 None 时不处理图片
+            
+        Returns:
+            处理后的内容
+        """
+        content = extract(item)
+        
+        # 处理图片（如果启用）
+        if source_dir is not None:
+            content = self.file_generator.process_images(content, source_dir)
+        
+        return content
+    
+    def _generate_tags_batch(self, items: List[tuple], tags_enabled: bool) -> List[Optional[List[str]]]:
+        """为 (章节或小节信息, 内容) 列表批量生成标签
+        
+        Returns:
+            与 items 一一对应的标签列表；未启用标签生成或生成失败时为 None
+        """
+        if not tags_enabled:
+            return [None] * len(items)
+        
+        return self.tag_generator.generate_tags_batch(
+            [(content, item.title) for item, content in items],
+            workers=self.config.tag_workers
+        )
+    
     def _add_navigation_to_files(self, file_paths: List[str]):
         """为生成的文件添加导航链接
         
@@ -317,32 +417,26 @@ class BookSplitter:
             统计信息
         """
         try:
+            total_lines = sum(chapter.line_count for chapter in chapters)
             stats = {
                 'source_file_size': Path(self.config.source_file).stat().st_size,
-                'total_lines': sum(chapter.line_count for chapter in chapters),
-                'average_chapter_length': (
-                    sum(chapter.line_count for chapter in chapters) / len(chapters)
-                    if chapters else 0
-                ),
-                'chapters_with_sections': len([c for c in chapters if c.has_sections]),
-                'sections_by_level': {},
+                'total_lines': total_lines,
+                'average_chapter_length': total_lines / len(chapters) if chapters else 0,
+                'chapters_with_sections': sum(1 for c in chapters if c.has_sections),
+                'sections_by_level': dict(Counter(section.level for section in sections)),
                 'total_tags': 0,
                 'unique_tags': 0
             }
             
-            # 小节级别统计
-            if sections:
-                for section in sections:
-                    level = section.level
-                    stats['sections_by_level'][level] = stats['sections_by_level'].get(level, 0) + 1
-            
             # 标签统计
             if self.config.generate_tags and sections:
-                all_tags = []
+                unique_tags = set()
+                total_tags = 0
                 for section in sections:
-                    all_tags.extend(section.tags)
-                stats['total_tags'] = len(all_tags)
-                stats['unique_tags'] = len(set(all_tags))
+                    unique_tags.update(section.tags)
+                    total_tags += len(section.tags)
+                stats['total_tags'] = total_tags
+                stats['unique_tags'] = len(unique_tags)
             
             # 组件统计
             if self.tag_generator:
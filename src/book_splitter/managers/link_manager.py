@@ -5,6 +5,7 @@
 """
 
 import logging
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -50,8 +51,11 @@ class LinkManager:
         # 构建目录内容
         toc_parts = []
         
+        # 生成时间只取一次，页眉和页脚使用同一时间
+        generated_at = datetime.now()
+        
         # 添加标题和元信息
-        toc_parts.append(self._create_toc_header(chapters, sections))
+        toc_parts.append(self._create_toc_header(chapters, sections, generated_at))
         
         # 添加章节目录
         toc_parts.append(self._create_chapters_toc(chapters))
@@ -64,19 +68,20 @@ class LinkManager:
         toc_parts.append(self._create_statistics_section(chapters, sections))
         
         # 添加页脚
-        toc_parts.append(self._create_toc_footer())
+        toc_parts.append(self._create_toc_footer(generated_at))
         
         self._toc_content = "\n\n".join(toc_parts)
         
         self.logger.info(f"目录生成完成，包含 {len(chapters)} 个章节，{len(sections)} 个小节")
         return self._toc_content
     
-    def _create_toc_header(self, chapters: List[ChapterInfo], sections: List[SectionInfo]) -> str:
+    def _create_toc_header(self, chapters: List[ChapterInfo], sections: List[SectionInfo],
+                           generated_at: datetime) -> str:
         """创建目录头部"""
         header_parts = [
             "# 目录",
             "",
-            f"📚 **文档拆分完成** - {datetime.now().strftime('%Y年%m月%d日 %H:%M')}",
+            f"📚 **文档拆分完成** - {generated_at.strftime('%Y年%m月%d日 %H:%M')}",
             "",
             f"本文档已被拆分为 **{len(chapters)}** 个章节文件"
         ]
@@ -234,7 +239,7 @@ class LinkManager:
         }
         return level_names.get(level, f"{level}级标题")
     
-    def _create_toc_footer(self) -> str:
+    def _create_toc_footer(self, generated_at: datetime) -> str:
         """创建目录页脚"""
         footer_parts = [
             "---",
@@ -250,7 +255,7 @@ class LinkManager:
         
         footer_parts.extend([
             "",
-            f"*由 BookSplitter 自动生成于 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
+            f"*由 BookSplitter 自动生成于 {generated_at.strftime('%Y-%m-%d %H:%M:%S')}*"
         ])
         
         return "\n".join(footer_parts)
@@ -327,7 +332,8 @@ class LinkManager:
             
             # 检查是否已有导航链接
             if "返回目录" in content:
-                self.logger.debug(f"文件已包含导航链接: {file_path}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"文件已包含导航链接: {file_path}")
                 return str(file_path)
             
             # 生成导航链接
@@ -343,7 +349,8 @@ class LinkManager:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             
-            self.logger.debug(f"已添加导航链接: {file_path}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"已添加导航链接: {file_path}")
             return str(file_path)
             
         except Exception as e:
@@ -389,12 +396,19 @@ class LinkManager:
         cross_refs = {}
         sections = sections or []
         
+        # 预先建立索引，避免对每个章节/小节重复线性扫描
+        sections_by_chapter = self._group_sections_by_chapter(sections)
+        chapters_by_title = {}
+        for chapter in chapters:
+            # 标题重复时与逐个查找一致，取第一个匹配的章节
+            chapters_by_title.setdefault(chapter.title, chapter)
+        
         # 为每个章节创建相关链接
         for chapter in chapters:
             refs = []
             
             # 添加章节内的小节链接
-            chapter_sections = [s for s in sections if s.chapter_title == chapter.title]
+            chapter_sections = sections_by_chapter.get(chapter.title, [])
             for section in chapter_sections:
                 if section.file_path:
                     refs.append(f"[{section.title}]({section.file_path})")
@@ -406,14 +420,13 @@ class LinkManager:
             refs = []
             
             # 添加所属章节链接
-            parent_chapter = next((c for c in chapters if c.title == section.chapter_title), None)
+            parent_chapter = chapters_by_title.get(section.chapter_title)
             if parent_chapter and parent_chapter.file_path:
                 refs.append(f"[{parent_chapter.title}]({parent_chapter.file_path})")
             
             # 添加同章节的其他小节链接
-            sibling_sections = [s for s in sections 
-                              if s.chapter_title == section.chapter_title and s != section]
-            for sibling in sibling_sections[:5]:  # 限制数量
+            sibling_sections = (s for s in sections_by_chapter[section.chapter_title] if s != section)
+            for sibling in islice(sibling_sections, 5):  # 限制数量
                 if sibling.file_path:
                     refs.append(f"[{sibling.title}]({sibling.file_path})")
             
@@ -30,3 +30,38 @@ def test_splitter_initialization():
     splitter = BookSplitter()
     assert splitter.config is not None
     assert splitter.config.source_file == "full.md"
+
+def test_config_from_file_formats(tmp_path):
+    """测试按扩展名及内容加载配置文件"""
+    yaml_file = tmp_path / "config.yaml"
+    yaml_file.write_text("output_dir: yaml_output\nmax_tags_per_section: 5\n", encoding="utf-8")
+    json_file = tmp_path / "config.json"
+    json_file.write_text('{"output_dir": "json_output"}', encoding="utf-8")
+    unknown_json = tmp_path / "config.conf"
+    unknown_json.write_text('  {"output_dir": "sniffed_json"}', encoding="utf-8")
+    unknown_yaml = tmp_path / "config.txt"
+    unknown_yaml.write_text("output_dir: sniffed_yaml\n", encoding="utf-8")
+
+    assert ProcessingConfig.from_file(str(yaml_file)).output_dir == "yaml_output"
+    assert ProcessingConfig.from_file(str(yaml_file)).max_tags_per_section == 5
+    assert ProcessingConfig.from_file(str(json_file)).output_dir == "json_output"
+    assert ProcessingConfig.from_file(str(unknown_json)).output_dir == "sniffed_json"
+    assert ProcessingConfig.from_file(str(unknown_yaml)).output_dir == "sniffed_yaml"
+
+    # 以 '{' 开头但不是合法 JSON 的 YAML 流式映射仍按 YAML 解析
+    unknown_flow = tmp_path / "flow.conf"
+    unknown_flow.write_text("{output_dir: flow}\n", encoding="utf-8")
+    assert ProcessingConfig.from_file(str(unknown_flow)).output_dir == "flow"
+
+    # 同一文件被改写后重新加载得到新内容
+    yaml_file.write_text("output_dir: yaml_output2\n", encoding="utf-8")
+    assert ProcessingConfig.from_file(str(yaml_file)).output_dir == "yaml_output2"
+    yaml_file.write_text("output_dir: yaml_output\nmax_tags_per_section: 5\n", encoding="utf-8")
+
+    # 每次加载都返回独立的配置对象
+    first = ProcessingConfig.from_file(str(yaml_file))
+    first.output_dir = "changed"
+    assert ProcessingConfig.from_file(str(yaml_file)).output_dir == "yaml_output"
+
+    with pytest.raises(FileNotFoundError):
+        ProcessingConfig.from_file(str(tmp_path / "missing.yaml"))
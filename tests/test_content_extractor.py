@@ -6,6 +6,7 @@
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # 添加src目录到Python路径
@@ -158,6 +159,36 @@ def test_context_extraction():
         raise
 
 
+def test_line_ranges_match_readlines():
+    """测试按行号提取的内容与 readlines() 切片结果一致"""
+    content = "# 第一章 导论\n\n正文\r中间\n\n一、概念\n最后一行"
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_file = Path(temp_dir) / "book.md"
+        source_file.write_text(content, encoding="utf-8", newline="")
+        
+        with open(source_file, 'r', encoding='utf-8') as f:
+            expected_lines = f.readlines()
+        
+        extractor = ContentExtractor(str(source_file))
+        assert extractor.get_extraction_statistics()['total_lines'] == len(expected_lines)
+        
+        for start in range(1, len(expected_lines) + 1):
+            for end in range(start, len(expected_lines) + 1):
+                assert extractor.extract_content(start, end) == ''.join(expected_lines[start - 1:end])
+        
+        # 复用分析阶段的文本时结果相同
+        extractor.clear_cache()
+        extractor.load_source_text(source_file.read_text(encoding="utf-8"))
+        assert extractor.extract_content(2, len(expected_lines)) == ''.join(expected_lines[1:])
+        
+        try:
+            extractor.extract_content(1, len(expected_lines) + 1)
+            assert False, "超出范围的行号应当报错"
+        except ValueError:
+            pass
+
+
 def main():
     """运行所有测试"""
     print("开始内容提取器测试...\n")
@@ -168,6 +199,8 @@ def main():
         test_chapter_section_extraction()
         print()
         test_context_extraction()
+        print()
+        test_line_ranges_match_readlines()
         
         print("\n🎉 所有内容提取器测试通过!")
         print("内容提取器功能已正确实现。")
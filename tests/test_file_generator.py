@@ -386,6 +386,110 @@ def test_error_handling():
         raise
 
 
+def test_batch_writes_complete_before_finish():
+    """测试批量写入：finish_batch_writes 返回时所有文件都已写入"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ProcessingConfig(output_dir=temp_dir, write_workers=4,
+                                  add_navigation=False, generate_tags=False)
+        file_generator = FileGenerator(config)
+        chapters = [ChapterInfo(f"第{i}章 标题{i}", i * 10 + 1, i * 10 + 9) for i in range(1, 21)]
+
+        file_generator.begin_batch_writes()
+        paths = [file_generator.create_chapter_file(chapter, f"正文{i}\n")
+                 for i, chapter in enumerate(chapters)]
+        assert file_generator.finish_batch_writes() == []
+
+        assert len(set(paths)) == len(chapters)
+        for i, path in enumerate(paths):
+            assert f"正文{i}\n" in Path(path).read_text(encoding="utf-8")
+        assert file_generator.get_generated_files() == paths
+
+
+def test_failed_batch_write_clears_file_path():
+    """测试批量写入失败：失败的文件从生成记录中移除，章节不再指向该文件"""
+    write_text = FileGenerator._write_text
+
+    def failing_write_text(file_path, content_parts):
+        if "第2章" in Path(file_path).name:
+            raise OSError("disk full")
+        write_text(file_path, content_parts)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ProcessingConfig(output_dir=temp_dir, write_workers=2,
+                                  add_navigation=False, generate_tags=False)
+        file_generator = FileGenerator(config)
+        chapters = [ChapterInfo(f"第{i}章 标题{i}", i * 10 + 1, i * 10 + 9) for i in range(1, 4)]
+
+        FileGenerator._write_text = staticmethod(failing_write_text)
+        try:
+            file_generator.begin_batch_writes()
+            paths = [file_generator.create_chapter_file(chapter, "正文\n") for chapter in chapters]
+            failed_files = file_generator.finish_batch_writes()
+        finally:
+            FileGenerator._write_text = staticmethod(write_text)
+
+        assert failed_files == [paths[1]]
+        assert file_generator.get_generated_files() == [paths[0], paths[2]]
+        assert chapters[1].file_path == ""
+        assert chapters[0].file_path and chapters[2].file_path
+
+
+def test_process_images_reuses_copied_images():
+    """测试图片复制：同一源图片只复制一次，同名的不同图片复制为不同文件"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "src"
+        (source_dir / "sub").mkdir(parents=True)
+        (source_dir / "a.png").write_bytes(b"first")
+        (source_dir / "sub" / "a.png").write_bytes(b"second")
+        output_dir = Path(temp_dir) / "out"
+
+        file_generator = FileGenerator(ProcessingConfig(output_dir=str(output_dir)))
+        chapter = file_generator.process_images("![x](a.png)\n![y](sub/a.png)\n", source_dir)
+        section = file_generator.process_images("![z](./a.png)\n", source_dir)
+
+        # 同一图片的不同写法共用一份副本，同名的不同图片按序号区分
+        assert chapter == "![x](images/a.png)\n![y](images/a_1.png)\n"
+        assert section == "![z](images/a.png)\n"
+        images_dir = output_dir / "images"
+        assert sorted(p.name for p in images_dir.iterdir()) == ["a.png", "a_1.png"]
+        assert (images_dir / "a.png").read_bytes() == b"first"
+        assert (images_dir / "a_1.png").read_bytes() == b"second"
+
+
+def test_process_images_copies_again_after_output_dir_change():
+    """测试图片复制：输出目录改变后重新复制图片，而不是复用旧目录中的副本"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "src"
+        source_dir.mkdir()
+        (source_dir / "a.png").write_bytes(b"image")
+
+        config = ProcessingConfig(output_dir=str(Path(temp_dir) / "first"))
+        file_generator = FileGenerator(config)
+        assert file_generator.process_images("![x](a.png)", source_dir) == "![x](images/a.png)"
+
+        config.output_dir = str(Path(temp_dir) / "second")
+        assert file_generator.process_images("![x](a.png)", source_dir) == "![x](images/a.png)"
+        assert (Path(temp_dir) / "second" / "images" / "a.png").read_bytes() == b"image"
+
+
+def test_chinese_to_arabic():
+    """测试中文数字转换"""
+    file_generator = FileGenerator(ProcessingConfig())
+
+    # 查表范围为"一"到"九十九"，逐一覆盖十位的边界
+    assert file_generator._chinese_to_arabic("一") == 1
+    assert file_generator._chinese_to_arabic("十") == 10
+    assert file_generator._chinese_to_arabic("十一") == 11
+    assert file_generator._chinese_to_arabic("二十") == 20
+    assert file_generator._chinese_to_arabic("二十三") == 23
+    assert file_generator._chinese_to_arabic("九十九") == 99
+    assert sorted(FileGenerator._CHINESE_NUMBERS.values()) == list(range(1, 100))
+
+    # 阿拉伯数字原样转换，表外的输入返回默认值1
+    assert file_generator._chinese_to_arabic("12") == 12
+    assert file_generator._chinese_to_arabic("一百") == 1
+
+
 def main():
     """运行所有测试"""
     print("开始文件生成器测试...\n")
@@ -404,6 +508,12 @@ def main():
         test_configuration_options()
         print()
         test_error_handling()
+        print()
+        test_batch_writes_complete_before_finish()
+        test_failed_batch_write_clears_file_path()
+        test_process_images_reuses_copied_images()
+        test_process_images_copies_again_after_output_dir_change()
+        test_chinese_to_arabic()
         
         print("\n🎉 所有文件生成器测试通过!")
         print("文件生成器功能已正确实现。")
@@ -6,6 +6,7 @@
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # 添加src目录到Python路径
@@ -80,12 +81,147 @@ def test_structure_analyzer():
         raise
 
 
+def test_mixed_heading_detection():
+    """测试章节与各级小节在同一次遍历中被正确识别"""
+    content = "\n".join([
+        "# 前言",
+        "# 第一章 政治学导论 12",
+        "# 第一节 基本概念",
+        "一、政治的含义",
+        "(一) 古代观点",
+        "### （一）近代观点",
+        "正文内容",
+        "## 二、国家理论",
+        "章节引言",
+        "二、国家的起源",
+        "正文内容",
+    ]) + "\n"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_file = Path(temp_dir) / "book.md"
+        source_file.write_text(content, encoding="utf-8")
+
+        analyzer = StructureAnalyzer(str(source_file))
+        result = analyzer.analyze_structure()
+        chapters = result['chapters']
+        sections = result['sections']
+
+        assert [c.title for c in chapters] == ["第一章 政治学导论", "二、国家理论"]
+        assert [(c.start_line, c.end_line) for c in chapters] == [(2, 7), (8, 11)]
+
+        assert [(s.title, s.level) for s in sections] == [
+            ("基本概念", 2),
+            ("政治的含义", 3),
+            ("古代观点", 4),
+            ("近代观点", 5),
+            ("国家的起源", 3),
+        ]
+        assert [s.chapter_title for s in sections] == [
+            "第一章 政治学导论", "第一章 政治学导论", "第一章 政治学导论",
+            "第一章 政治学导论", "二、国家理论",
+        ]
+        assert [(s.start_line, s.end_line) for s in sections] == [
+            (3, 7), (4, 7), (5, 7), (6, 7), (10, 11),
+        ]
+        assert len(chapters[0].sections) == 4
+        assert len(chapters[1].sections) == 1
+        assert analyzer.validate_structure() == []
+
+
+def test_line_numbers_with_crlf_and_missing_trailing_newline():
+    """测试CRLF换行与末行无换行符时的行号计算"""
+    content = "\r\n".join([
+        "前言",
+        "",
+        "  # 第一章 导论  ",
+        "一、概念",
+        "正文",
+        "# 第二章 国家",
+        "正文",
+        "最后一行",
+    ])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_file = Path(temp_dir) / "book.md"
+        source_file.write_bytes(content.encode("utf-8"))
+
+        analyzer = StructureAnalyzer(str(source_file))
+        result = analyzer.analyze_structure()
+
+        assert [(c.title, c.start_line, c.end_line) for c in result['chapters']] == [
+            ("第一章 导论", 3, 5),
+            ("第二章 国家", 6, 8),
+        ]
+        assert [(s.title, s.start_line) for s in result['sections']] == [("概念", 4)]
+        assert analyzer.get_statistics()['total_lines'] == 8
+
+
+def test_section_end_stops_before_next_chapter():
+    """测试小节结束行不会越过紧随其后的章节标题"""
+    content = "\n".join([
+        "# 第一章 导论",
+        "一、概念",
+        "正文",
+        "## 二、国家理论",
+        "二、起源",
+        "正文",
+    ]) + "\n"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_file = Path(temp_dir) / "book.md"
+        source_file.write_text(content, encoding="utf-8")
+
+        analyzer = StructureAnalyzer(str(source_file))
+        result = analyzer.analyze_structure()
+
+        assert [(c.start_line, c.end_line) for c in result['chapters']] == [(1, 3), (4, 6)]
+        assert [(s.start_line, s.end_line) for s in result['sections']] == [(2, 3), (5, 6)]
+        assert [len(c.sections) for c in result['chapters']] == [1, 1]
+
+
+def test_validate_structure_reports_overlaps_once():
+    """测试结构验证：每对重叠章节只报告一次，小节按所有已开始章节的范围判断"""
+    from book_splitter.models import ChapterInfo, SectionInfo
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_file = Path(temp_dir) / "book.md"
+        source_file.write_text("", encoding="utf-8")
+        analyzer = StructureAnalyzer(str(source_file))
+
+    analyzer.chapters = [
+        ChapterInfo("第三章", 30, 40),
+        ChapterInfo("第一章", 1, 20),
+        ChapterInfo("第二章", 10, 15),
+        ChapterInfo("第四章", 40, 50),
+        ChapterInfo("第五章", 60, 61),
+    ]
+    analyzer.sections = [
+        SectionInfo("一、嵌套", 12, 14, "第二章", 2),
+        SectionInfo("二、外层", 18, 19, "第一章", 2),
+        SectionInfo("三、间隙", 25, 27, "第一章", 2),
+        SectionInfo("四、卷首", 0, 1, "第一章", 2),
+        SectionInfo("五、末章", 45, 48, "第四章", 2),
+    ]
+
+    assert analyzer.validate_structure() == [
+        "章节重叠: 第一章 和 第二章",
+        "章节重叠: 第三章 和 第四章",
+        "小节不在任何章节范围内: 三、间隙",
+        "小节不在任何章节范围内: 四、卷首",
+        "空章节: 第五章",
+    ]
+
+
 def main():
     """运行测试"""
     print("开始结构分析器测试...\n")
 
     try:
         test_structure_analyzer()
+        test_mixed_heading_detection()
+        test_line_numbers_with_crlf_and_missing_trailing_newline()
+        test_section_end_stops_before_next_chapter()
+        test_validate_structure_reports_overlaps_once()
         print("\n🎉 结构分析器测试完成!")
 
     except Exception as e:
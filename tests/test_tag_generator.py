@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+标签生成器测试脚本
+
+测试TagGenerator类的批量标签生成功能。
+"""
+
+import sys
+from pathlib import Path
+
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from book_splitter.generators import TagGenerator
+
+
+ITEMS = [
+    ("政治学研究国家、政府和权力。公民参与选举与投票。", "政治学导论"),
+    ("市场经济与财政税收，社会阶级结构的变迁。", "经济与社会"),
+    ("民主制度与法治建设，宪法保障公民权利。", "民主与法治"),
+]
+
+
+def test_generate_tags_batch_sequential():
+    """测试 workers=1 时在当前进程中逐项生成，结果与单独调用一致"""
+    generator = TagGenerator()
+    expected = [generator.generate_tags(content, title) for content, title in ITEMS]
+
+    assert generator.generate_tags_batch(ITEMS, workers=1) == expected
+    assert generator.generate_tags_batch(ITEMS) == expected
+
+
+def test_generate_tags_batch_empty():
+    """测试空列表返回空结果（顺序与多进程两种路径）"""
+    generator = TagGenerator()
+
+    assert generator.generate_tags_batch([]) == []
+    assert generator.generate_tags_batch([], workers=2) == []
+
+
+def test_generate_tags_batch_parallel_matches_sequential():
+    """测试多进程批量生成标签与顺序生成结果一致"""
+    generator = TagGenerator()
+
+    assert generator.generate_tags_batch(ITEMS, workers=2) == generator.generate_tags_batch(ITEMS)
+
+
+def test_begin_batch_shares_pool_across_batches():
+    """测试分批生成：begin_batch 后各批共用同一进程池，finish_batch 后关闭"""
+    generator = TagGenerator()
+    expected = generator.generate_tags_batch(ITEMS)
+
+    generator.begin_batch(2)
+    try:
+        executor = generator._executor
+        assert executor is not None
+        results = generator.generate_tags_batch(ITEMS[:2]) + generator.generate_tags_batch(ITEMS[2:])
+        assert generator._executor is executor
+    finally:
+        generator.finish_batch()
+
+    assert results == expected
+    assert generator._executor is None
+
+
+def main():
+    """运行所有测试"""
+    print("开始标签生成器测试...\n")
+
+    try:
+        test_generate_tags_batch_sequential()
+        test_generate_tags_batch_empty()
+        test_generate_tags_batch_parallel_matches_sequential()
+        test_begin_batch_shares_pool_across_batches()
+
+        print("\n🎉 所有标签生成器测试通过!")
+
+    except Exception as e:
+        print(f"\n❌ 测试失败: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,8 @@ import sys
 import glob
 import argparse
 import json
-import yaml
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 # 添加父目录到系统路径
@@ -27,6 +28,7 @@ def load_config(config_file):
         if ext == '.json':
             return json.load(f)
         elif ext in ['.yaml', '.yml']:
+            import yaml
             return yaml.safe_load(f)
         else:
             raise ValueError(f"不支持的配置文件格式：{ext}")
@@ -57,14 +59,36 @@ def process_file(file_path, base_config, output_dir=None):
     
     return result
 
+def process_file_summary(file_path, base_config, output_dir=None):
+    """处理单个文件并返回结果摘要（可在子进程中调用）"""
+    try:
+        result = process_file(file_path, base_config, output_dir)
+        return {
+            'file': file_path,
+            'status': result['status'],
+            'files_count': result['generated_files_count']
+        }
+    except Exception as e:
+        print(f"处理文件 {file_path} 时出错：{str(e)}")
+        return {
+            'file': file_path,
+            'status': 'error',
+            'error': str(e)
+        }
+
 def main():
     parser = argparse.ArgumentParser(description='批量处理Markdown文件')
     parser.add_argument('--config', '-c', required=True, help='基础配置文件路径')
     parser.add_argument('--input', '-i', required=True, help='输入文件或目录')
     parser.add_argument('--pattern', '-p', default='*.md', help='文件匹配模式（默认：*.md）')
     parser.add_argument('--output', '-o', help='输出根目录')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='并行处理的进程数（默认：1，逐个处理）')
     
     args = parser.parse_args()
+    if args.workers > 1 and not args.output:
+        # 未指定输出根目录时所有文件写入同一输出目录，并行处理会相互覆盖
+        parser.error('--workers 大于 1 时必须指定 --output')
     
     # 加载基础配置
     base_config = load_config(args.config)
@@ -81,23 +105,15 @@ def main():
     
     print(f"找到 {len(files)} 个文件待处理")
     
-    # 处理文件
-    results = []
-    for file_path in files:
-        try:
-            result = process_file(file_path, base_config, args.output)
-            results.append({
-                'file': file_path,
-                'status': result['status'],
-                'files_count': result['generated_files_count']
-            })
-        except Exception as e:
-            print(f"处理文件 {file_path} 时出错：{str(e)}")
-            results.append({
-                'file': file_path,
-                'status': 'error',
-                'error': str(e)
-            })
+    # 处理文件（各文件相互独立，可在多个进程中并行处理）
+    workers = min(args.workers, len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                process_file_summary, files, repeat(base_config), repeat(args.output)
+            ))
+    else:
+        results = [process_file_summary(file_path, base_config, args.output) for file_path in files]
     
     # 输出统计信息
     success_count = sum(1 for r in results if r['status'] == 'success')